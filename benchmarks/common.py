@@ -0,0 +1,72 @@
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_gallerynpy(revision: str = None):
+    """
+    Imports the gallerynpy package with the renpy stubs of the `store` package, as the IDE does.
+
+    The gallerynpy init code is run with a temporary game folder, so the db files are not written into the repo.
+    :param revision: A git revision. If given, the `gallerynpy` and `store` packages of that revision are imported
+        instead of the ones of the working tree, so the results can be compared with an older version.
+    :return: The imported gallerynpy package.
+    """
+    root = ROOT
+    if revision:
+        root = tempfile.mkdtemp()
+        archive = subprocess.run(["git", "archive", revision, "gallerynpy", "store"], cwd=ROOT,
+                                 stdout=subprocess.PIPE, check=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(root)
+    sys.path.insert(0, root)
+
+    import store
+    store.renpy.config.basedir = tempfile.mkdtemp()
+    import gallerynpy
+    return gallerynpy
+
+
+def best_of(function, number: int, repeat: int = 5) -> float:
+    """
+    Measures the given function.
+    :param function: The function to call, without arguments.
+    :param number: The number of calls in each measure.
+    :param repeat: The number of measures.
+    :return: The seconds per call of the best measure.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def microseconds(function, calls: int, number: int = 1) -> str:
+    """
+    Measures the given function, that does the given number of calls of the measured operation.
+    :param function: The function to call, without arguments.
+    :param calls: The number of operations in each call of the function.
+    :param number: The number of calls in each measure.
+    :return: The formatted microseconds per operation of the best measure.
+    """
+    return "{:.3f}".format(best_of(function, number) / calls * 1e6)
+
+
+def run(description: str, benchmark):
+    """
+    Parses the command line arguments, loads gallerynpy and prints the results of the given benchmark.
+    :param description: The description of the benchmark.
+    :param benchmark: A function that receives the gallerynpy package and returns the (label, value) results.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--revision", help="the git revision to measure (default the working tree)")
+    args = parser.parse_args()
+
+    gallerynpy = load_gallerynpy(args.revision)
+    print("{} ({})".format(description, args.revision or "working tree"))
+    for (label, value) in benchmark(gallerynpy):
+        print("  {:<40} {}".format(label, value))
@@ -0,0 +1,22 @@
+from . import common
+
+SLIDES = 5000
+FILLED = 50
+
+
+def benchmark(gallerynpy):
+    slider = gallerynpy.Slider("bench")
+    for index in range(SLIDES):
+        slide = slider.create_slide("slide{}".format(index))
+        # one of each SLIDES // FILLED slides has an item
+        if index % (SLIDES // FILLED) == 0:
+            slide.put(gallerynpy.create_item("images/cg{}.png".format(index)))
+    gallerynpy.put_slide_like(slider)
+    gallerynpy.handler.change_slide("bench")
+
+    yield "slides (with items)", "{} ({})".format(SLIDES, len(gallerynpy.content_slides()))
+    yield "content_slides() (us per call)", common.microseconds(gallerynpy.content_slides, 1)
+
+
+if __name__ == "__main__":
+    common.run("content_slides over {:,} mostly empty slides".format(SLIDES), benchmark)
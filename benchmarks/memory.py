@@ -0,0 +1,36 @@
+import gc
+import sys
+import tracemalloc
+from . import common
+
+ITEMS = 100000
+
+
+def instance_size(obj) -> int:
+    """
+    Gets the bytes of the given instance, with its attributes dict if it has one, but not the attribute values.
+    """
+    return sys.getsizeof(obj) + (sys.getsizeof(vars(obj)) if hasattr(obj, "__dict__") else 0)
+
+
+def benchmark(gallerynpy):
+    paths = ["images/chapter{}/cg{}.png".format(index % 10, index) for index in range(ITEMS)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [gallerynpy.create_item(path) for path in paths]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # the Item, Resource and Thumbnail instances, without their names, paths or the caches of the resources
+    instances = sum(instance_size(item) + instance_size(item.resource) + instance_size(item.thumbnail)
+                    for item in items)
+
+    yield "items", len(items)
+    yield "bytes per item (everything allocated)", "{:.0f}".format(float(after - before) / len(items))
+    yield "bytes per item (the instances)", "{:.0f}".format(float(instances) / len(items))
+
+
+if __name__ == "__main__":
+    common.run("Memory of {:,} image items".format(ITEMS), benchmark)
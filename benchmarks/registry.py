@@ -0,0 +1,73 @@
+import gc
+import sys
+import time
+import tracemalloc
+from . import common
+
+ITEMS = 20000
+SLIDES = 20
+
+
+def record_gallery():
+    """
+    Makes the stub renpy `Gallery` keep its buttons and images, as the renpy one does,
+    so releasing it frees memory.
+    """
+    gallery = sys.modules["store"].Gallery
+
+    def button(self, name, *args, **kwargs):
+        if not hasattr(self, "buttons"):
+            self.buttons = {}
+        self.buttons[name] = [name]
+
+    def image(self, displayable, *args, **kwargs):
+        self.buttons[next(reversed(self.buttons))].append(displayable)
+
+    gallery.button = button
+    gallery.image = image
+
+
+def reenter(gallerynpy) -> tuple[float, float]:
+    """
+    Leaves the gallery and enters it again.
+    :return: The KiB released on leaving and the milliseconds taken to enter again.
+    """
+    handler = gallerynpy.handler
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    # what the back action of the gallery does on leaving it
+    handler._Handler__release_gallery()
+    gc.collect()
+    released = before - tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    handler.update()
+    return released / 1024.0, (time.perf_counter() - start) * 1000
+
+
+def benchmark(gallerynpy):
+    record_gallery()
+    properties = gallerynpy.properties
+    properties.load_in_put = True
+    properties.load_budget = None
+    handler = gallerynpy.handler
+    for index in range(ITEMS):
+        handler.put_item(handler.create_item("images/cg{}.png".format(index)), "slide{}".format(index % SLIDES))
+    handler.check_puts()
+
+    tracemalloc.start()
+    yield "items", ITEMS
+    for keep_registry in (False, True):
+        properties.keep_registry = keep_registry
+        # the first re-entry fills the registry, if it is kept
+        reenter(gallerynpy)
+        results = [reenter(gallerynpy) for _ in range(5)]
+        label = "keep_registry {}".format("on" if keep_registry else "off")
+        yield label + ": KiB released", "{:.0f}".format(min(released for (released, _) in results))
+        yield label + ": ms to re-enter", "{:.1f}".format(min(latency for (_, latency) in results))
+        # the revisions before the registry don't have it
+        yield label + ": registry size", getattr(handler, "registry_size", "-")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    common.run("Gallery release and re-entry with {:,} items".format(ITEMS), benchmark)
@@ -0,0 +1,22 @@
+from . import common
+
+ENTRIES = 50000
+
+
+def benchmark(gallerynpy):
+    db = gallerynpy.db
+    paths = ["images/chapter{}/scene{}/cg{}.png".format(index % 10, index % 100, index) for index in range(ENTRIES)]
+    for (index, path) in enumerate(paths):
+        db.put_size(path, gallerynpy.Size(1920, 1080 + index % 7))
+
+    def lookup():
+        for path in paths:
+            db.get_size(path)
+
+    seconds = common.best_of(lookup, number=1) / ENTRIES
+    yield "entries", ENTRIES
+    yield "get_size lookups per second", "{:,.0f}".format(1 / seconds)
+
+
+if __name__ == "__main__":
+    common.run("SizesDb.get_size over {:,} entries".format(ENTRIES), benchmark)
@@ -0,0 +1,39 @@
+from . import common
+
+SLIDES = 10000
+LOOKUPS = 1000
+
+
+def benchmark(gallerynpy):
+    slider = gallerynpy.Slider("bench")
+    names = ["slide{}".format(index) for index in range(SLIDES)]
+    for name in names:
+        slider.create_slide(name)
+    gallerynpy.put_slide_like(slider)
+    handler = gallerynpy.handler
+    handler.change_slide("bench")
+
+    # the names of the render path, spread over the slider
+    sample = names[::SLIDES // LOOKUPS]
+
+    def get():
+        for name in sample:
+            slider.get(name)
+
+    def contains():
+        for name in sample:
+            name in slider
+
+    def slide_size():
+        for name in sample:
+            handler.slide_size(name)
+
+    yield "slides", SLIDES
+    yield "Slider.get (us per lookup)", common.microseconds(get, len(sample))
+    yield "name in Slider (us per lookup)", common.microseconds(contains, len(sample))
+    yield "Slider.slides (us per access)", common.microseconds(lambda: slider.slides, 1, number=100)
+    yield "Handler.slide_size (us per lookup)", common.microseconds(slide_size, len(sample))
+
+
+if __name__ == "__main__":
+    common.run("Slider lookups over {:,} slides".format(SLIDES), benchmark)
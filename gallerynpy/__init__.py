@@ -21,10 +21,11 @@
 
 from .utils import *
 from .db import *
-from . import resources, actions
+from . import resources, actions, dimensions
 from .properties import *
 from .items import *
 from .slides import *
+from .search import *
 from .handler import *
 from .compat import *
 from .start import *
@@ -38,6 +38,50 @@ def load_named_resources():
     gallerynpy.handler.check_puts()
 
 
+def refresh_loadable_files():
+    """
+    Lists the game files again, e.g. after adding files while the game is running,
+    and forgets the resources and thumbnails resolved with the previous listing.
+    """
+    gallerynpy.loadable_files.refresh()
+    gallerynpy.resources.resolutions.clear()
+    gallerynpy.resources.atlases.clear()
+    gallerynpy.resources.forget_video_thumbnails()
+
+
+def warm_up_sizes():
+    """
+    Starts reading in background the sizes of the images that are not in the db,
+    if `gallerynpy.properties.warm_up_sizes` is true.
+    """
+    if gallerynpy.properties.warm_up_sizes:
+        gallerynpy.resources.sizes_loader.load(gallerynpy.properties.warm_up_workers)
+    else:
+        gallerynpy.resources.sizes_loader.clear()
+
+
+def warm_up_progress():
+    """
+    Gets the progress of reading the sizes in background.
+
+    The sizes read so far are put into their resources first (see `gallerynpy.resources.SizesLoader.merge`).
+    :return: The progress from 0 to 1, or None if it is not running.
+    """
+    loader = gallerynpy.resources.sizes_loader
+    loader.merge()
+    return loader.progress if loader.running else None
+
+
+def is_registering():
+    """
+    Checks if there are gallery items left to load incrementally.
+
+    See also `gallerynpy.properties.load_budget`
+    :return: True if there are items left, False otherwise.
+    """
+    return gallerynpy.handler.registering
+
+
 def to_first_slide(sort: bool = False):
     """
     Changes the selected slide name to the name of the first valid slide in the current slider.
@@ -111,7 +155,7 @@ def content_slides():
     """
     Gets the name of all slides that have at least one item into.
     """
-    return [name for name in gallerynpy.handler.current_slides if gallerynpy.handler.slide_size(name) > 0]
+    return gallerynpy.handler.current_content_slides
 
 
 def custom_name_for(slide_name: str, new_name: str):
@@ -145,6 +189,15 @@ def is_current(name: str):
     return gallerynpy.handler.is_current_slide(name)
 
 
+def search_items(query: str):
+    """
+    Gets the action to show the items that match the given query, by their tooltip, tags or slide names.
+    :param query: The text to search.
+    :return: The action to show the search slide.
+    """
+    return Function(gallerynpy.handler.show_search, query)
+
+
 def change_slide_to(slide_name: str):
     """
     Gets the action to change the current selected slide.
@@ -180,7 +233,8 @@ def update(start: bool = False):
 
 
 def put_item(where: str, resource, thumbnail=None, song: str = None,
-             condition: str = None, tooltip: str = None, for_animation_slide: bool = False):
+             condition: str = None, tooltip: str = None, for_animation_slide: bool = False,
+             tags: list[str] | str = None):
     """
     Creates a new item and put it into the gallerynpy gallery.
     :param where: The name of the slide to put the item into
@@ -191,8 +245,9 @@ def put_item(where: str, resource, thumbnail=None, song: str = None,
     :param tooltip: The tooltip text to display when the item is hovered.
     :param for_animation_slide: If true and the slide with the given name has not yet been created, the slide is marked
         as one for animations.
+    :param tags: The tags to search the item by.
     """
-    item = create_item(resource, thumbnail, song, condition, tooltip)
+    item = create_item(resource, thumbnail, song, condition, tooltip, tags)
     gallerynpy.handler.put_item(item, where, for_animation_slide)
 
 
@@ -222,7 +277,7 @@ def put_animation(animation_name: str | gallerynpy.resources.Resource, thumbnail
 
 
 def create_item(resource, thumbnail=None, song: str = None, condition: str = None,
-                tooltip: str = None):
+                tooltip: str = None, tags: list[str] | str = None):
     """
     Creates an item with the given params.
     :param resource: The item resource
@@ -230,11 +285,12 @@ def create_item(resource, thumbnail=None, song: str = None, condition: str = Non
     :param song: A valid filepath for an audio that renpy can load.
     :param condition: The condition to unlock the item.
     :param tooltip: The tooltip text to display when the item is hovered.
+    :param tags: The tags to search the item by.
     :return: The created item.
 
     :raises ValueError: If the given resource is None.
     """
-    return gallerynpy.handler.create_item(resource, thumbnail, song, condition, tooltip)
+    return gallerynpy.handler.create_item(resource, thumbnail, song, condition, tooltip, tags)
 
 
 def create_image(image, song: str = None, condition: str = None, tooltip: str = None, thumbnail_resource=None, ):
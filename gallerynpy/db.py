@@ -28,19 +28,25 @@ The gallerynpy stored module.
 from store import gallerynpy
 """
 
+import hashlib
 import json
+import mmap
+import os
+import struct
+import zlib
+from store import python_object, python_dict
 
 
 def is_size(obj):
     """
-    Checks if the given object is instance of `Size`
+    Checks if the given object is instance of `Size` or `FrozenSize`
 
     :param obj: The object to check.
     """
-    return isinstance(obj, Size)
+    return isinstance(obj, (Size, FrozenSize))
 
 
-class Size:
+class Size(object):
     """
     Represents the dimensions (integers) of an image.
     """
@@ -137,64 +143,710 @@ class Size:
         return "<Size of {}x{}>".format(self.width, self.height)
 
 
+class FrozenSize(python_object):
+    """
+    Represents the dimensions (integers) of an image, which cannot be changed.
+
+    Unlike `Size`, it is hashable, and the instances with the same dimensions can be shared (see `FrozenSize.of`).
+    """
+
+    __slots__ = ("__width", "__height")
+
+    POOL_CAPACITY = 4096
+    """
+    The maximum number of dimensions kept in the interning pool of `FrozenSize.of`.
+    """
+
+    # not a store dict, so the interned sizes don't take part in rollback
+    _pool = python_dict()
+
+    def __init__(self, width: int, height: int):
+        """
+        :param width: The width dimension.
+        :param height: The height dimension.
+        :raises ValueError: If a dimension is negative.
+        """
+        width = int(width)
+        height = int(height)
+        if width < 0 or height < 0:
+            raise ValueError('A dimension cannot be negative')
+        self.__width = width
+        self.__height = height
+
+    @classmethod
+    def of(cls, width: int, height: int) -> "FrozenSize":
+        """
+        Gets the size with the given dimensions, reusing the same instance for the same dimensions while the
+        interning pool has room for them.
+        :param width: The width dimension.
+        :param height: The height dimension.
+        :return: The size object.
+        :raises ValueError: If a dimension is negative.
+        """
+        key = (int(width), int(height))
+        size = cls._pool.get(key)
+        if size is None:
+            size = FrozenSize(key[0], key[1])
+            if len(cls._pool) < cls.POOL_CAPACITY:
+                cls._pool[key] = size
+        return size
+
+    @staticmethod
+    def from_size(size: "Size | FrozenSize") -> "FrozenSize":
+        """
+        Gets the frozen size with the dimensions of the given size.
+        :param size: The size object
+        :raises TypeError: If the given size not is an instance of Size or FrozenSize.
+        :return: The frozen size object.
+        """
+        if isinstance(size, FrozenSize):
+            return size
+        if not is_size(size):
+            raise TypeError('The size must be an instance of Size')
+        return FrozenSize.of(size.width, size.height)
+
+    @property
+    def width(self) -> int:
+        """
+        Gets the width of the size.
+        """
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        """
+        Gets the height of the size.
+        """
+        return self.__height
+
+    @property
+    def aspect_ratio(self):
+        """
+        Gets the aspect ratio of the dimensions.
+
+        Calculated as `width / height`.
+
+        :return: The calculated aspect ratio.
+        """
+        if self.__height == 0:
+            return 0.0
+        return float(self.__width) / self.__height
+
+    def __eq__(self, other):
+        if not is_size(other):
+            return False
+        return self.__width == other.width and self.__height == other.height
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.__width, self.__height))
+
+    def __repr__(self):
+        return "<FrozenSize of {}x{}>".format(self.__width, self.__height)
+
+
+class SizesStorage(object):
+    """
+    The base class for the storage backends of `SizesDb`.
+
+    A storage only knows how to read and write the sizes from its source file,
+    the `SizesDb` keeps the sizes that have not yet been saved.
+
+    The file is always replaced atomically, keeping the previous one as a backup. If the file is corrupt
+    (its checksum doesn't match) or missing after an interrupted write, the backup is loaded instead,
+    and it is counted in `fallbacks`.
+    """
+
+    EXTENSION = ""
+    """
+    The file extension used by the storage.
+    """
+
+    BACKUP_EXTENSION = ".bak"
+    """
+    The extension appended to the source path for the backup file.
+    """
+
+    def __init__(self, source: str):
+        """
+        :param source: The absolute path of the storage file.
+        """
+        self._source = str(source)
+        self._fallbacks = 0
+        self._intact = False
+
+    @property
+    def source(self) -> str:
+        """
+        Gets the absolute path of the storage file.
+        """
+        return self._source
+
+    @property
+    def backup(self) -> str:
+        """
+        Gets the absolute path of the backup file.
+        """
+        return self._source + self.BACKUP_EXTENSION
+
+    @property
+    def fallbacks(self) -> int:
+        """
+        Gets the number of times the backup was loaded because the storage file was corrupt or missing.
+        """
+        return self._fallbacks
+
+    @staticmethod
+    def checksum(data: bytes) -> int:
+        """
+        Calculates the checksum written in the header of the storage files.
+        :param data: The bytes to calculate the checksum for.
+        :return: The unsigned crc32 of the data.
+        """
+        return zlib.crc32(data) & 0xFFFFFFFF
+
+    def load(self) -> bool:
+        """
+        Loads the stored sizes from the source file, or from the backup file if the source is not valid.
+        :return: True if the sizes were loaded, False otherwise.
+        """
+        self.close()
+        self._intact = self._read(self.source)
+        if self._intact:
+            return True
+        if os.path.isfile(self.backup) and self._read(self.backup):
+            self._fallbacks += 1
+            return True
+        return False
+
+    def _read(self, path: str) -> bool:
+        """
+        Reads the stored sizes from the given file.
+        :param path: The absolute path of the file, the source or the backup.
+        :return: True if the file exists and is valid, False otherwise.
+        """
+        raise NotImplementedError("Must be implemented in child")
+
+    def _replace(self, data: bytes):
+        """
+        Replaces the source file with the given data.
+
+        The previous source file is kept as backup, unless it was not valid when it was loaded.
+        :param data: The full contents of the new file.
+        """
+        gallerynpy.replace_file(self.source, data, self.backup if self._intact else None)
+        self._intact = True
+
+    def get(self, path: str) -> tuple[int, int] | None:
+        """
+        Gets the stored dimensions for the given path.
+        :param path: The image filepath or the image name joined with `SizesDb.NAMED`, normalized in the renpy form.
+        :return: A tuple with the (width, height) values, or None if it doesn't present.
+        """
+        raise NotImplementedError("Must be implemented in child")
+
+    def write(self, sizes: dict) -> dict:
+        """
+        Writes the stored sizes, together with the given ones, into the source file.
+        :param sizes: The new sizes to write. Its keys are paths, normalized in the renpy form,
+            and its values (width, height) tuples.
+        :return: The given sizes that the storage cannot hold, so they were not written.
+        """
+        raise NotImplementedError("Must be implemented in child")
+
+    def close(self):
+        """
+        Releases the resources used for the storage.
+        """
+
+
+class JsonSizesStorage(SizesStorage):
+    """
+    A storage that saves the sizes as nested json objects, one object for each folder of the path.
+
+    The nested objects are only the file format, once loaded the sizes are kept in a flat index by path.
+    The json is preceded by a header line with the checksum of it. Files without the header are still read,
+    but they cannot be checked.
+    """
+
+    EXTENSION = ".json"
+
+    HEADER = "gallerynpy-sizes"
+
+    def __init__(self, source: str):
+        """
+        :param source: The absolute path of the json file.
+        """
+        super(JsonSizesStorage, self).__init__(source)
+        self.__sizes = {}
+
+    @staticmethod
+    def flatten(sizes: dict) -> dict:
+        """
+        Flattens the nested json objects into a dict by path.
+        :param sizes: The nested json objects.
+        :return: The dict with the paths as keys and the (width, height) tuples as values.
+        """
+        flat = {}
+        pending = [("", sizes)]
+        while pending:
+            prefix, target = pending.pop()
+            for (name, value) in target.items():
+                path = prefix + gallerynpy.RENPY_SEP + name if prefix else name
+                if isinstance(value, dict):
+                    pending.append((path, value))
+                elif isinstance(value, list) and len(value) == 2:
+                    flat[path] = (value[0], value[1])
+        return flat
+
+    @staticmethod
+    def nest(sizes: dict) -> dict:
+        """
+        Nests the given sizes into json objects, one for each folder of the path.
+        :param sizes: The dict with the paths as keys and the (width, height) tuples as values.
+        :return: The nested json objects.
+        """
+        nested = {}
+        for (path, (width, height)) in sizes.items():
+            folders = path.split(gallerynpy.RENPY_SEP)
+            target = nested
+            for folder in folders[:-1]:
+                if not folder:
+                    continue
+                if folder not in target:
+                    target[folder] = {}
+                target = target[folder]
+            target[folders[-1]] = [width, height]
+        return nested
+
+    def _read(self, path: str):
+        self.__sizes = {}
+        try:
+            with gallerynpy.file(path) as fs:
+                content = fs.read()
+        except (IOError, OSError, ValueError):
+            return False
+
+        if content.startswith(self.HEADER):
+            header, _, content = content.partition("\n")
+            try:
+                checksum = int(header[len(self.HEADER):].strip(), 16)
+            except ValueError:
+                return False
+            if checksum != self.checksum(content.encode("utf-8")):
+                return False
+
+        try:
+            sizes = json.loads(content)
+        except ValueError:
+            return False
+
+        if not isinstance(sizes, dict):
+            return False
+        self.__sizes = self.flatten(sizes)
+        return True
+
+    def get(self, path: str):
+        return self.__sizes.get(path)
+
+    def items(self):
+        """
+        Gets all the stored sizes.
+        :return: An iterable of (path, (width, height)) tuples.
+        """
+        return self.__sizes.items()
+
+    def write(self, sizes: dict):
+        self.__sizes.update(sizes)
+        content = json.dumps(self.nest(self.__sizes)).encode("utf-8")
+        header = "{} {:08x}\n".format(self.HEADER, self.checksum(content)).encode("utf-8")
+        self._replace(header + content)
+        return {}
+
+    def __len__(self):
+        return len(self.__sizes)
+
+    def __str__(self):
+        return str(self.nest(self.__sizes))
+
+
+class BinarySizesStorage(SizesStorage):
+    """
+    A compact binary storage, read lazily through a memory map.
+
+    The file has a header (magic, version, count and the checksum of the rest of the file), followed by
+    the sorted 64-bit hashes of the paths and then by the `uint16` (width, height) pairs in the same order as the hashes.
+
+    If neither the file nor its backup exist, but a json file with the same name does, the sizes are migrated from it.
+
+    A dimension greater than `MAX_DIMENSION` doesn't fit in the file, so `write` returns those sizes
+    instead of writing them, and `SizesDb` keeps them in its journal.
+    """
+
+    EXTENSION = ".bin"
+
+    MAGIC = b"GNSZ"
+    VERSION = 1
+
+    HEADER = struct.Struct("<4sHHII")
+    HASH = struct.Struct("<Q")
+    PAIR = struct.Struct("<HH")
+    MAX_DIMENSION = 0xFFFF
+
+    def __init__(self, source: str):
+        """
+        :param source: The absolute path of the binary file.
+        """
+        super(BinarySizesStorage, self).__init__(source)
+        self.__map = None
+        self.__count = 0
+
+    @staticmethod
+    def hash(path: str) -> int:
+        """
+        Gets the 64-bit hash used as index for the given path.
+        :param path: The image filepath or the image name joined with `SizesDb.NAMED`, normalized in the renpy form.
+        """
+        digest = hashlib.md5(path.encode("utf-8")).digest()
+        return BinarySizesStorage.HASH.unpack(digest[:BinarySizesStorage.HASH.size])[0]
+
+    @property
+    def count(self) -> int:
+        """
+        Gets the number of stored sizes.
+        """
+        return self.__count
+
+    def __migrate(self):
+        legacy = JsonSizesStorage(os.path.splitext(self.source)[0] + JsonSizesStorage.EXTENSION)
+        if not legacy.load():
+            return False
+        sizes = dict(legacy.items())
+        if not sizes:
+            return False
+        try:
+            self.write(sizes)
+        except (IOError, OSError):
+            return False
+        return True
+
+    def load(self):
+        if super(BinarySizesStorage, self).load():
+            return True
+        if not os.path.isfile(self.source) and not os.path.isfile(self.backup):
+            return self.__migrate()
+        return False
+
+    def _read(self, path: str):
+        try:
+            with gallerynpy.file(path, mode="rb", encoding=None) as fs:
+                if os.fstat(fs.fileno()).st_size < self.HEADER.size:
+                    return False
+                mapped = mmap.mmap(fs.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            return False
+
+        magic, version, _, count, checksum = self.HEADER.unpack_from(mapped, 0)
+        expected = self.HEADER.size + count * (self.HASH.size + self.PAIR.size)
+        if magic != self.MAGIC or version != self.VERSION or len(mapped) != expected \
+                or checksum != self.checksum(mapped[self.HEADER.size:]):
+            mapped.close()
+            return False
+
+        self.__map = mapped
+        self.__count = count
+        return True
+
+    def __index(self, key: int) -> int:
+        low, high = 0, self.__count - 1
+        offset = self.HEADER.size
+        while low <= high:
+            middle = (low + high) // 2
+            current = self.HASH.unpack_from(self.__map, offset + middle * self.HASH.size)[0]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle - 1
+            else:
+                return middle
+        return -1
+
+    def get(self, path: str):
+        if self.__map is None:
+            return None
+        index = self.__index(self.hash(path))
+        if index < 0:
+            return None
+        offset = self.HEADER.size + self.__count * self.HASH.size + index * self.PAIR.size
+        return self.PAIR.unpack_from(self.__map, offset)
+
+    def __entries(self) -> dict:
+        if self.__map is None or not self.__count:
+            return {}
+        offset = self.HEADER.size
+        hashes = struct.unpack_from("<{}Q".format(self.__count), self.__map, offset)
+        offset += self.__count * self.HASH.size
+        pairs = struct.unpack_from("<{}H".format(self.__count * 2), self.__map, offset)
+        return dict((key, (pairs[index * 2], pairs[index * 2 + 1])) for (index, key) in enumerate(hashes))
+
+    def write(self, sizes: dict):
+        entries = self.__entries()
+        oversized = {}
+        for (path, (width, height)) in sizes.items():
+            if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
+                oversized[path] = (width, height)
+                continue
+            entries[self.hash(path)] = (width, height)
+
+        keys = sorted(entries.keys())
+        count = len(keys)
+        pairs = []
+        for key in keys:
+            pairs.extend(entries[key])
+
+        content = struct.pack("<{}Q".format(count), *keys) + struct.pack("<{}H".format(count * 2), *pairs)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, 0, count, self.checksum(content))
+
+        # the mapped file must be released before it is replaced, and mapped again even if the replace fails
+        self.close()
+        try:
+            self._replace(header + content)
+        finally:
+            if not self._read(self.source):
+                self._intact = False
+                self._read(self.backup)
+        return oversized
+
+    def close(self):
+        if self.__map is not None:
+            self.__map.close()
+        self.__map = None
+        self.__count = 0
+
+    def __str__(self):
+        return "<BinarySizesStorage of '{}' with {} sizes>".format(self.source, self.count)
+
+
+class SizesJournal(object):
+    """
+    An append-only log of sizes, kept next to the storage file of `SizesDb`.
+
+    Each line is a json array with the path, the width and the height. A torn final line,
+    left by an interrupted write, is ignored when the journal is replayed.
+    """
+
+    EXTENSION = ".journal"
+
+    def __init__(self, source: str):
+        """
+        :param source: The absolute path of the journal file.
+        """
+        self.__source = str(source)
+        self.__count = 0
+        self.__torn = False
+
+    @property
+    def source(self) -> str:
+        """
+        Gets the absolute path of the journal file.
+        """
+        return self.__source
+
+    @property
+    def count(self) -> int:
+        """
+        Gets the number of sizes in the journal.
+        """
+        return self.__count
+
+    def replay(self) -> dict:
+        """
+        Reads all the sizes in the journal.
+        :return: The dict with the paths as keys and the (width, height) tuples as values.
+        """
+        sizes = {}
+        self.__count = 0
+        self.__torn = False
+        try:
+            with gallerynpy.file(self.source) as fs:
+                for line in fs:
+                    self.__torn = not line.endswith("\n")
+                    try:
+                        path, width, height = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    sizes[path] = (width, height)
+                    self.__count += 1
+        except (IOError, OSError):
+            pass
+        return sizes
+
+    def append(self, sizes: dict):
+        """
+        Appends the given sizes at the end of the journal.
+        :param sizes: The dict with the paths as keys and the (width, height) tuples as values.
+        """
+        lines = [json.dumps([path, width, height]) + "\n" for (path, (width, height)) in sizes.items()]
+        if self.__torn:
+            # ends the torn line, so it doesn't swallow the first new one
+            lines.insert(0, "\n")
+        with gallerynpy.file(self.source, mode="a", encoding="utf-8") as fs:
+            fs.write("".join(lines))
+            fs.flush()
+        self.__torn = False
+        self.__count += len(sizes)
+
+    def clear(self):
+        """
+        Removes the journal file.
+        """
+        if os.path.isfile(self.source):
+            os.remove(self.source)
+        self.__count = 0
+        self.__torn = False
+
+
 class SizesDb(gallerynpy.Singleton):
     """
-    A dumb json db for save the image dimensions.
+    A dumb db for save the image dimensions.
     It inherits from Singleton, so there will be only one instance of it.
+
+    The sizes are read and written by a `SizesStorage` backend, by default chosen from the basename extension
+    (see `SizesDb.STORAGES`).
+
+    In journal mode, the save only appends the new sizes to a `SizesJournal`, and the storage file is rewritten
+    when the journal reaches the `journal_threshold` or when `compact` is called.
+
+    The sizes are only merged from the main thread. The `gallerynpy.resources.SizesLoader` threads only read
+    the image headers, and the loader puts their results into the db.
     """
     NAMED = "SizesDbNamed"
 
-    def __init__(self, basename: str, folder: str):
+    STORAGES = {
+        JsonSizesStorage.EXTENSION: JsonSizesStorage,
+        BinarySizesStorage.EXTENSION: BinarySizesStorage,
+    }
+    """
+    The storage backends by file extension.
+    """
+
+    def __init__(self, basename: str, folder: str, storage: type = None, journal: bool = False):
         """
-        :param basename: The base name of the json file. e.g. `images.json`
-        :param folder: The folder path where the json file is. Must be relative to the game folder of the game.
+        :param basename: The base name of the db file. e.g. `images.json` or `images.bin`
+        :param folder: The folder path where the db file is. Must be relative to the game folder of the game.
+        :param storage: The `SizesStorage` subclass to use. If not given, it is chosen from the basename extension,
+            and if there is none for it, the `JsonSizesStorage` is used.
+        :param journal: If true, the db is saved in journal mode.
         """
         self.__folder = str(folder)
         self.__basename = str(basename)
         self.__source = gallerynpy.join_path(self.__folder, self.__basename)
-        self.__sizes = {}
-        self.__save = False
-        try:
-            with gallerynpy.file(self.__source, from_game=True) as fs:
-                self.__sizes = json.load(fs)
-        except:
-            pass
+        if storage is None:
+            storage = SizesDb.STORAGES.get(gallerynpy.file_extension(self.__basename), JsonSizesStorage)
+        self.__storage = storage(gallerynpy.join_path(gallerynpy.gamepath(), self.__source))
+        self.__journal = SizesJournal(self.__storage.source + SizesJournal.EXTENSION)
+        self.__failed_saves = 0
+        self.__version = 0
+        self.journal = journal
+        self.journal_threshold = 512
+        """
+        The number of sizes in the journal from which the save compacts it into the storage file.
+        
+        Default is 512.
+        """
+        self.__storage.load()
+        # sizes not yet written into the storage file and, of those, the ones not yet saved at all
+        self.__sizes = self.__journal.replay()
+        self.__unsaved = set()
+
+    @property
+    def storage(self) -> SizesStorage:
+        """
+        Gets the storage backend of the db.
+        """
+        return self.__storage
+
+    @property
+    def fallbacks(self) -> int:
+        """
+        Gets the number of times the storage backup was loaded because the storage file was corrupt or missing.
+        """
+        return self.__storage.fallbacks
+
+    @property
+    def version(self) -> int:
+        """
+        Gets the number of times a new or different size was put into the db.
 
-    def __get_size(self, path: str) -> Size | None:
-        target = self.__sizes
-        folders, name = gallerynpy.split_folders(path)
+        It can be used to know if a size read before may have changed.
+        """
+        return self.__version
 
-        for folder in folders:
-            if folder not in target.keys():
-                return None
-            target = target[folder]
+    @property
+    def failed_saves(self) -> int:
+        """
+        Gets the number of saves that could not be written.
+        """
+        return self.__failed_saves
 
-        if name in target.keys():
-            if len(target[name]) != 2:
-                return None
+    @property
+    def journal(self) -> bool:
+        """
+        Gets whether the db is saved in journal mode.
+        """
+        return self.__journal_mode
 
-            return Size(target[name][0], target[name][1])
+    @journal.setter
+    def journal(self, journal: bool):
+        """
+        Sets whether the db is saved in journal mode.
 
-        return None
+        The sizes already in the journal are kept until the next compaction, whatever the mode is.
+        :param journal: The new value.
+        """
+        self.__journal_mode = bool(journal)
 
-    def get_size(self, path: str, named: bool = False, folder: str = None) -> Size | None:
+    @staticmethod
+    def __key(path: str, named: bool, folder: str | None) -> str:
+        if named:
+            folder = SizesDb.NAMED
+        if folder:
+            path = folder + gallerynpy.RENPY_SEP + str(path)
+        else:
+            path = str(path)
+
+        # most of the paths are already in the renpy form, so the normalization can be skipped
+        if gallerynpy.is_renpy_path(path):
+            return path
+        return gallerynpy.normalize_path(path, for_renpy=True)
+
+    def __get_pair(self, key: str) -> tuple[int, int] | None:
+        size = self.__sizes.get(key)
+        if size is None:
+            return self.__storage.get(key)
+        return size
+
+    def __get_size(self, key: str) -> FrozenSize | None:
+        size = self.__get_pair(key)
+        if size is None:
+            return None
+        return FrozenSize.of(size[0], size[1])
+
+    def get_size(self, path: str, named: bool = False, folder: str = None) -> FrozenSize | None:
         """
-        Gets from the json object the size for the given path.
+        Gets from the db the size for the given path.
         :param path: The image filepath or image name.
         :param named: If true, the path is considered as an image name.
         :param folder: The base folder of the path. If given, will be joined with the `path` param.
         :return: The size for the `path` or None if it doesn't present.
         """
-        if named:
-            folder = SizesDb.NAMED
-        if folder:
-            path = gallerynpy.join_path(folder, path)
-
-        return self.__get_size(path)
+        return self.__get_size(self.__key(path, named, folder))
 
     def put_size(self, path: str, size: Size, named: bool = False, folder: str = None):
         """
-        Puts from the json object the size for the given path.
+        Puts into the db the size for the given path.
         :param path: The image filepath or image name.
         :param size: The image size to put.
         :param named: If true, the path is considered as an image name.
@@ -203,21 +855,13 @@ class SizesDb(gallerynpy.Singleton):
         if not is_size(size):
             return
 
-        if named:
-            folder = SizesDb.NAMED
-
-        if folder:
-            path = gallerynpy.join_path(folder, path)
-
-        folders, name = gallerynpy.split_folders(path)
-        target = self.__sizes
-        for folder in folders:
-            if folder and folder not in target.keys():
-                target[folder] = {}
-            target = target[folder]
-
-        self.__save = name not in target.keys() if not self.__save else self.__save
-        target[name] = [size.width, size.height]
+        key = self.__key(path, named, folder)
+        pair = (size.width, size.height)
+        if self.__get_pair(key) == pair:
+            return
+        self.__sizes[key] = pair
+        self.__version += 1
+        self.__unsaved.add(key)
 
     def contains(self, path: str, named: bool = False, folder: str = None) -> bool:
         """
@@ -230,16 +874,38 @@ class SizesDb(gallerynpy.Singleton):
 
     def save(self):
         """
-        Saves the current json object as a json file.
+        Saves the sizes that were put since the last save.
+
+        In journal mode, they are appended to the journal, and it is compacted if it reaches the `journal_threshold`.
+        Otherwise, they are written into the storage file.
         """
-        if self.__save:
-            try:
-                gallerynpy.make_dir(self.__folder, from_game=True)
-                with gallerynpy.file(self.__source, mode="w", encoding="utf-8", from_game=True) as fs:
-                    json.dump(self.__sizes, fs)
-                self.__save = False
-            except:
-                pass
+        if not self.__unsaved:
+            return
+        try:
+            gallerynpy.make_dir(self.__folder, from_game=True)
+            if not self.journal:
+                self.compact()
+                return
+            self.__journal.append(dict((key, self.__sizes[key]) for key in self.__unsaved))
+            self.__unsaved.clear()
+            if self.__journal.count >= self.journal_threshold:
+                self.compact()
+        except (IOError, OSError, ValueError):
+            self.__failed_saves += 1
+
+    def compact(self):
+        """
+        Writes all the sizes not yet in the storage file into it, and clears the journal.
+
+        The sizes that the storage cannot hold are written back into the journal, so they are not lost.
+        """
+        if self.__sizes:
+            gallerynpy.make_dir(self.__folder, from_game=True)
+            self.__sizes = self.__storage.write(self.__sizes)
+            self.__unsaved.clear()
+        self.__journal.clear()
+        if self.__sizes:
+            self.__journal.append(self.__sizes)
 
     def __contains__(self, item):
         item = str(item)
@@ -248,7 +914,7 @@ class SizesDb(gallerynpy.Singleton):
         return self.contains(item)
 
     def __str__(self):
-        return str(self.__sizes)
+        return str(self.__storage)
 
 
 db: SizesDb | None = None
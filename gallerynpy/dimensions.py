@@ -0,0 +1,171 @@
+# Copyright © 2023-2024, Yoimer Davila. <https://github.com/yoimerdr/gallerynpy>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import gallerynpy
+
+"""renpy
+init -5 python in gallerynpy.dimensions:
+# docstring:1
+The gallerynpy.dimensions stored module.
+from store import gallerynpy
+"""
+
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+RIFF_SIGNATURE = b"RIFF"
+WEBP_SIGNATURE = b"WEBP"
+
+JPEG_SOF_MARKERS = (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF)
+"""
+The JPEG start of frame markers, the segments with the image dimensions.
+"""
+
+JPEG_STANDALONE_MARKERS = (0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8)
+"""
+The JPEG markers without a length field.
+"""
+
+JPEG_SOS_MARKER = 0xDA
+
+
+def png_size(header: bytes) -> tuple[int, int] | None:
+    """
+    Reads the dimensions from the IHDR chunk of a PNG file.
+    :param header: At least the first 24 bytes of the file.
+    :return: The (width, height) tuple, or None if the header is not from a valid PNG file.
+    """
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def webp_size(header: bytes) -> tuple[int, int] | None:
+    """
+    Reads the dimensions from the first chunk (VP8, VP8L or VP8X) of a WebP file.
+    :param header: At least the first 30 bytes of the file.
+    :return: The (width, height) tuple, or None if the header is not from a valid WebP file.
+    """
+    if len(header) < 30 or not header.startswith(RIFF_SIGNATURE) or header[8:12] != WEBP_SIGNATURE:
+        return None
+
+    chunk = header[12:16]
+    if chunk == b"VP8 ":
+        # lossy, after the 3 bytes of the frame tag and the 3 bytes of the start code
+        if header[23:26] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    elif chunk == b"VP8L":
+        # lossless, 14 bits for each dimension minus one after the signature byte
+        if header[20:21] != b"\x2f":
+            return None
+        bits = struct.unpack("<I", header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b"VP8X":
+        # extended, 24 bits for each dimension of the canvas minus one
+        width = struct.unpack("<I", header[24:27] + b"\x00")[0]
+        height = struct.unpack("<I", header[27:30] + b"\x00")[0]
+        return width + 1, height + 1
+    return None
+
+
+def jpeg_size(fs) -> tuple[int, int] | None:
+    """
+    Reads the dimensions from the start of frame segment of a JPEG file.
+
+    Only the segment headers are read, the other segments are skipped.
+    :param fs: The binary file object, positioned after the first two bytes (SOI marker).
+    :return: The (width, height) tuple, or None if there is no valid start of frame segment.
+    """
+    while True:
+        byte = fs.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+
+        # a marker can be preceded by any number of fill bytes
+        while byte == b"\xff":
+            byte = fs.read(1)
+        if not byte:
+            return None
+
+        marker = ord(byte)
+        if marker in JPEG_STANDALONE_MARKERS or marker == 0x00:
+            continue
+
+        length = fs.read(2)
+        if len(length) < 2:
+            return None
+        length = struct.unpack(">H", length)[0]
+
+        if marker in JPEG_SOF_MARKERS:
+            data = fs.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        elif marker == JPEG_SOS_MARKER or length < 2:
+            return None
+
+        fs.seek(length - 2, 1)
+
+
+def probe(fs) -> tuple[int, int] | None:
+    """
+    Reads the dimensions of an image from its header, without decoding it.
+
+    The supported formats are PNG, JPEG and WebP.
+    :param fs: The binary file object, positioned at the start of the file.
+    :return: The (width, height) tuple, or None if the format is not supported or the header is not valid.
+    """
+    header = fs.read(30)
+    if header.startswith(PNG_SIGNATURE):
+        return png_size(header)
+    elif header.startswith(RIFF_SIGNATURE):
+        return webp_size(header)
+    elif header.startswith(JPEG_SIGNATURE):
+        fs.seek(len(JPEG_SIGNATURE))
+        return jpeg_size(fs)
+    return None
+
+
+def image_size(path: str) -> tuple[int, int] | None:
+    """
+    Reads the dimensions of the image at the given path from its header, without decoding it.
+
+    See also `probe`
+    :param path: The image filepath. It can be any file that renpy can load, even from an archive.
+    :return: The (width, height) tuple, or None if the file cannot be opened or its header is not valid.
+    """
+    if not path:
+        return None
+    try:
+        with gallerynpy.open_game_file(path) as fs:
+            size = probe(fs)
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+    if size is None or not size[0] or not size[1]:
+        return None
+    return size
@@ -27,7 +27,8 @@ init -1 python in gallerynpy:
 The gallerynpy stored module.
 from store import gallerynpy
 """
-from store import Button, Function, Gallery, dissolve, Call, Play, Stop, Null, config, Return, NullAction
+import time
+from store import renpy, Button, Function, Gallery, dissolve, Call, Play, Stop, Null, config, Return, NullAction
 
 
 def init():
@@ -63,7 +64,16 @@ class Handler(gallerynpy.Singleton):
         self.__cols = 0
 
         self.__thumbnail_size = None
+        self.__page_items = None
+        self.__borders = {}
         self.__gallery_released = False
+        self.__pending = None
+        self.__pending_current = None
+        self.__registry = {}
+        self.__index = gallerynpy.SearchIndex()
+        self.__search = None
+        self.__predicted = ()
+        self.__predicted_key = None
         self.__gallery = Gallery()
         self.__gallery.transition = dissolve
 
@@ -76,6 +86,39 @@ class Handler(gallerynpy.Singleton):
         self.__current_name = ""
         self.__item_id = 0
 
+    def __invalidate_page_items(self):
+        """
+        Discards the buttons built for the current page, so they are built again in the next `page_items` call.
+        """
+        self.__page_items = None
+
+    def __scaled_border(self, name: str):
+        """
+        Gets the scaled resource of the `gallerynpy.properties` attribute with the given name.
+
+        The scaled resource is created once per thumbnail size, and again only if the source of the attribute changes.
+        :param name: The name of the resource attribute, e.g. `idle`.
+        """
+        resource = getattr(gallerynpy.properties, name)
+        entry = self.__borders.get(name)
+        if entry is not None and entry[0] is resource and entry[1] is resource.resource:
+            return entry[2]
+
+        scaled = self.scale_res(resource)
+        if entry is not None:
+            self.__invalidate_page_items()
+        self.__borders[name] = (resource, resource.resource, scaled)
+        return scaled
+
+    def __slide(self, name: str) -> gallerynpy.SlideLike | None:
+        """
+        Gets the slide or slider with the given name in the current slider, or the current search slide.
+        :param name: The slide name.
+        """
+        if self.__search is not None and name == self.__search.name:
+            return self.__search
+        return self.__current_slider[name]
+
     def __change_tooltip(self, tooltip: str):
         """
         Change tooltip current tooltip text.
@@ -91,16 +134,30 @@ class Handler(gallerynpy.Singleton):
         if not gallerynpy.is_item(item):
             return
 
-        self.__gallery.button(item.name)
-        if item.resource.is_image_type:
-            image = item.resource.resource
-            if gallerynpy.properties.rescale_images:
+        source = item.resource.resource
+        rescale = gallerynpy.properties.rescale_images
+        spec = self.__registry.get(item.name)
+        if spec is None or spec[0] is not source or spec[1] != rescale:
+            image = source
+            if rescale and item.resource.is_image_type:
                 image = item.resource.composite_to(gallerynpy.screen_size)
-            self.__gallery.image(image)
+            spec = (source, rescale, image, item.condition)
         else:
-            self.__gallery.image(item.resource.resource)
-        if item.condition:
-            self.__gallery.condition(item.condition)
+            spec = spec[:3] + (item.condition,)
+        if gallerynpy.properties.keep_registry:
+            self.__registry[item.name] = spec
+        self.__add_spec_to_gallery(item.name, spec)
+
+    def __add_spec_to_gallery(self, name: str, spec: tuple):
+        """
+        Adds a button to the gallerynpy gallery from the registered spec of an item.
+        :param name: The item name.
+        :param spec: The (source, rescale, displayable, condition) tuple of the item.
+        """
+        self.__gallery.button(name)
+        self.__gallery.image(spec[2])
+        if spec[3]:
+            self.__gallery.condition(spec[3])
 
     def __change_current_slider(self, name: str, slider: gallerynpy.Slider):
         """
@@ -115,32 +172,29 @@ class Handler(gallerynpy.Singleton):
             return True
         return False
 
-    def __add_slide_to_gallery(self, slide: gallerynpy.Slide):
-        """
-        Adds all the items in the given slide to the gallerynpy gallery.
-        :param slide: The slide with the items to add.
-        """
-        if not gallerynpy.is_slide(slide):
-            return
-        for item in slide:
-            self.__add_to_gallery(item)
-
     def __slide_like_to_gallery(self, slider: gallerynpy.Slider | gallerynpy.Slide):
         """
         Adds all the items in the slide (or slider) to the gallerynpy gallery.
 
-        This method could call itself recursively, so be aware of the possible RecursionError
+        See also `gallerynpy.walk_items`
         :param slider: The slide or slider with the items to add.
         """
-        if gallerynpy.is_slider(slider):
-            for (_, slide) in slider:
-                if gallerynpy.is_slider(slide):
-                    self.__slide_like_to_gallery(slide)
-                else:
-                    self.__add_slide_to_gallery(slide)
+        for (_, _, item) in gallerynpy.walk_items(slider):
+            self.__add_to_gallery(item)
+
+    def __start_registration(self):
+        """
+        Starts adding all the items in the base slider to the gallerynpy gallery.
 
+        If `gallerynpy.properties.load_budget` is set, the items are added in chunks by `register_pending`,
+        otherwise all at once.
+        """
+        if gallerynpy.properties.load_budget:
+            self.__pending = (item for (_, _, item) in gallerynpy.walk_items(self.__sliders))
+            self.__pending_current = None
         else:
-            self.__add_slide_to_gallery(slider)
+            self.__pending = None
+            self.__slide_like_to_gallery(self.__sliders)
 
     def __change_to_parent(self):
         """
@@ -149,6 +203,8 @@ class Handler(gallerynpy.Singleton):
         self.__current_slider = self.__current_slider.parent
         if self.__current_slider is None:
             self.__current_slider = self.__sliders
+        self.__search = None
+        self.__invalidate_page_items()
 
         self.to_first_slide(gallerynpy.properties.sort_slides)
 
@@ -163,17 +219,27 @@ class Handler(gallerynpy.Singleton):
         self.__gallery.transition = dissolve
         self.__gallery_released = False
         if gallerynpy.properties.load_in_put:
-            self.__slide_like_to_gallery(self.__sliders)
+            self.__start_registration()
+        elif gallerynpy.properties.keep_registry:
+            for (name, spec) in self.__registry.items():
+                self.__add_spec_to_gallery(name, spec)
 
     def __release_gallery(self):
         """
         Releases (del) the gallerynpy gallery if it is necessary.
-        :return:
+
+        It also stops the prediction of the thumbnails of the adjacent pages.
         """
+        self.__stop_prediction()
         if gallerynpy.properties.keep_loaded:
             return
         del self.__gallery
         self.__gallery_released = True
+        if not gallerynpy.properties.keep_registry:
+            self.__registry.clear()
+        self.__pending = None
+        self.__pending_current = None
+        self.__invalidate_page_items()
 
     @property
     def start(self):
@@ -196,6 +262,22 @@ class Handler(gallerynpy.Singleton):
         """
         return self.__thumbnail_size
 
+    @property
+    def registry_size(self) -> int:
+        """
+        Gets the number of items kept in the registry used to rebuild the gallerynpy gallery.
+
+        See also `gallerynpy.properties.keep_registry`
+        """
+        return len(self.__registry)
+
+    @property
+    def registering(self) -> bool:
+        """
+        Checks if there are items left to add to the gallerynpy gallery by `register_pending`.
+        """
+        return self.__pending is not None
+
     @property
     def columns(self):
         """
@@ -222,21 +304,28 @@ class Handler(gallerynpy.Singleton):
         """
         Gets the scaled idle resource of the gallerynpy gallery.
         """
-        return self.scale_res(gallerynpy.properties.idle)
+        return self.__scaled_border("idle")
 
     @property
     def play_idle_res(self):
         """
         Gets the scaled play_idle resource of the gallerynpy gallery.
         """
-        return self.scale_res(gallerynpy.properties.play_idle)
+        return self.__scaled_border("play_idle")
 
     @property
     def play_hover_res(self):
         """
         Gets the scaled play_hover resource of the gallerynpy gallery.
         """
-        return self.scale_res(gallerynpy.properties.play_hover)
+        return self.__scaled_border("play_hover")
+
+    @property
+    def locked_res(self):
+        """
+        Gets the scaled locked resource of the gallerynpy gallery.
+        """
+        return self.__scaled_border("locked")
 
     @property
     def current_slides(self):
@@ -245,6 +334,17 @@ class Handler(gallerynpy.Singleton):
         """
         return self.__current_slider.slides
 
+    @property
+    def current_content_slides(self):
+        """
+        Gets the names of the current slider items that are not empty.
+
+        They are in natural order if `gallerynpy.properties.sort_slides` is true.
+        """
+        if gallerynpy.properties.sort_slides:
+            return self.__current_slider.sorted_content_slides
+        return self.__current_slider.content_slides
+
     @property
     def current_slide_name(self):
         """
@@ -265,6 +365,7 @@ class Handler(gallerynpy.Singleton):
         :param page: The new page number.
         """
         self.__page = int(page)
+        self.__invalidate_page_items()
 
     def change_distribution(self, columns: int = None, rows: int = None):
         """
@@ -293,17 +394,18 @@ class Handler(gallerynpy.Singleton):
         self.__cols = columns
 
         properties = gallerynpy.properties
-        target = max(columns, rows)
-        spacing = gallerynpy.properties.item_xspacing * (target - 1)
-        actual_width = config.screen_width - properties.navigation_xsize - properties.navigation_spacing - spacing
-        width = actual_width / target
-
-        new_size = gallerynpy.Size(width, width / gallerynpy.screen_size.aspect_ratio)
+        actual_width = config.screen_width - properties.navigation_xsize - properties.navigation_spacing
+        new_size = gallerynpy.Size(*gallerynpy.thumbnail_dimensions(
+            columns, rows, actual_width, properties.item_xspacing, gallerynpy.screen_size.aspect_ratio
+        ))
         if self.thumbnail_size is None:
             self.__thumbnail_size = new_size
         else:
             self.thumbnail_size.set(new_size)
-        self.__gallery.locked_button = self.scale_res(properties.locked)
+        gallerynpy.resources.thumbnails_cache.clear()
+        self.__invalidate_page_items()
+        self.__borders.clear()
+        self.__gallery.locked_button = self.locked_res
 
     def scale_res(self, resource: gallerynpy.resources.Resource):
         """
@@ -343,9 +445,11 @@ class Handler(gallerynpy.Singleton):
             self.__sliders.put(slide)
 
         slide.put(item)
+        self.__index.add(item, where)
+        self.__invalidate_page_items()
 
     def create_item(self, resource, thumbnail=None, song: str = None, condition: str = None,
-                    tooltip: str = None):
+                    tooltip: str = None, tags: list[str] | str = None):
         """
         Creates an item with the given params.
         :param resource: The item resource
@@ -353,6 +457,7 @@ class Handler(gallerynpy.Singleton):
         :param song: A valid filepath for an audio that renpy can load.
         :param condition: The condition to unlock the item.
         :param tooltip: The tooltip text to display when the item is hovered.
+        :param tags: The tags to search the item by.
         :return: The created item.
 
         :raises ValueError: If the given resource is None.
@@ -366,7 +471,8 @@ class Handler(gallerynpy.Singleton):
             size=self.thumbnail_size,
             song=song,
             condition=condition,
-            tooltip=tooltip
+            tooltip=tooltip,
+            tags=tags
         )
         item.thumbnail.set_custom(thumbnail)
         self.__item_id += 1
@@ -394,14 +500,88 @@ class Handler(gallerynpy.Singleton):
         Adds the given slide or slider to the base slider and all its items to the gallerynpy gallery.
         :param slide: The slide or slider to add
         """
-        self.__sliders.put(slide)
+        if self.__sliders.put(slide):
+            self.index_items(slide)
+
+    def index_items(self, slide: gallerynpy.Slide | gallerynpy.Slider = None):
+        """
+        Adds the items in the given slide or slider to the search index, by their tooltip, tags and slide names.
+
+        The items put with `put_item` or `put_slide_like` are indexed automatically, this is needed only for the items
+        put directly into a slide.
+        :param slide: The slide or slider with the items to index. By default, is the base slider.
+        """
+        if slide is None:
+            slide = self.__sliders
+        names = () if slide is self.__sliders else (slide.name,)
+        for (path, _, item) in gallerynpy.walk_items(slide):
+            self.__index.add(item, *(names + path))
+
+    def search(self, query: str) -> gallerynpy.Slide:
+        """
+        Searches the indexed items that match every word of the given query.
+
+        See also `gallerynpy.SearchIndex.search`
+        :param query: The text to search.
+        :return: A slide, without parent, with the matching items.
+        """
+        query = str(gallerynpy.or_default(query, ""))
+        slide = gallerynpy.Slide(query)
+        slide.extend(self.__index.search(query))
+        return slide
+
+    def show_search(self, query: str):
+        """
+        Changes the current slide to the slide with the items that match the given query.
+
+        See also `search`
+        :param query: The text to search.
+        """
+        self.__search = self.search(query)
+        self.__current_name = self.__search.name
+        self.__page = 0
+        self.__invalidate_page_items()
 
     def check_puts(self):
         """
         Adds all items in the base slider to the gallery if `gallerynpy.properties.load_in_put` is true.
         """
         if gallerynpy.properties.load_in_put:
-            self.__slide_like_to_gallery(self.__sliders)
+            self.__start_registration()
+
+    def register_pending(self, budget: float = None) -> bool:
+        """
+        Adds the items left by an incremental registration to the gallerynpy gallery, for at most the given time.
+
+        The items of the current slide are added before the rest of them. The items already in the gallery
+        are skipped without checking the time, so each call adds at least one item while any is left.
+        :param budget: The maximum time in seconds. By default, is `gallerynpy.properties.load_budget`.
+        :return: True if there are no items left, False otherwise.
+        """
+        if self.__pending is None:
+            return True
+        if budget is None:
+            budget = gallerynpy.properties.load_budget or 0
+        deadline = time.time() + budget
+
+        slide = self.__slide(self.__current_name)
+        if gallerynpy.is_slide(slide) and (self.__pending_current is None or self.__pending_current[0] is not slide):
+            self.__pending_current = (slide, iter(slide))
+
+        sources = (self.__pending,) if self.__pending_current is None else (self.__pending_current[1], self.__pending)
+        buttons = self.__gallery.buttons
+        for source in sources:
+            for item in source:
+                # the items already added are skipped without spending the budget
+                if item.name in buttons:
+                    continue
+                self.__add_to_gallery(item)
+                if time.time() >= deadline:
+                    return False
+
+        self.__pending = None
+        self.__pending_current = None
+        return True
 
     def change_slide(self, name: str):
         """
@@ -409,12 +589,14 @@ class Handler(gallerynpy.Singleton):
         :param name: The name of the slide, or slide, to change.
         """
         name = str(gallerynpy.or_default(name, ""))
-        if name and name in self.current_slides:
+        if name and name in self.__current_slider:
+            self.__search = None
             if self.__change_current_slider(name, self.__current_slider):
                 self.to_first_slide(gallerynpy.properties.sort_slides)
             else:
                 self.__current_name = name
             self.__page = 0
+            self.__invalidate_page_items()
 
     def is_current_slide(self, name: str):
         """
@@ -429,7 +611,7 @@ class Handler(gallerynpy.Singleton):
         Checks if the current slide is one for animations
         :return: True if the current slide is one for animations, False otherwise
         """
-        slide: gallerynpy.Slide | None = self.__current_slider[self.__current_name]
+        slide: gallerynpy.Slide | None = self.__slide(self.__current_name)
         return gallerynpy.is_slide(slide) and slide.is_for_animations
 
     def make_item_button(self, item: gallerynpy.Item):
@@ -443,8 +625,11 @@ class Handler(gallerynpy.Singleton):
             return button
 
         if not gallerynpy.properties.load_in_put:
-            if not gallerynpy.properties.keep_loaded or item.name not in self.__gallery.buttons.keys():
+            keep = gallerynpy.properties.keep_loaded or gallerynpy.properties.keep_registry
+            if not keep or item.name not in self.__gallery.buttons.keys():
                 self.__add_to_gallery(item)
+        elif self.__pending is not None and item.name not in self.__gallery.buttons:
+            self.__add_to_gallery(item)
 
         hover_border = None
         if item.resource.is_image_type or item.resource.is_displayable_type:
@@ -486,19 +671,17 @@ class Handler(gallerynpy.Singleton):
     def to_first_slide(self, sort: bool = False):
         """
         Changes the selected slide name to the name of the first valid slide in the current slider.
-        :param sort: If true, sorts slide names before the change.
-        """
-        names = self.current_slides
-        if names:
-            if sort:
-                names.sort()
-
-            for name in names:
-                slide: gallerynpy.Slide | None = self.__current_slider[name]
-                if gallerynpy.is_slide(slide) and not (gallerynpy.properties.with_speed and slide.is_for_animations):
-                    self.change_slide(name)
-                    return
+        :param sort: If true, takes the slide names in natural order.
+        """
+        slider = self.__current_slider
+        if not slider.size:
+            return
+        self.__search = None
+        name = slider.first_slide(sort, gallerynpy.properties.with_speed)
+        if name is None:
             self.__current_name = ""
+        else:
+            self.change_slide(name)
 
     def item_at(self, where: str, index: int) -> gallerynpy.Item | None:
         """
@@ -508,7 +691,7 @@ class Handler(gallerynpy.Singleton):
         :return: The item at the given index. If the index is out of range or the object
             with the `where` name in the current slider not is a slide, return None
         """
-        slide = self.__current_slider[where]
+        slide = self.__slide(where)
         if not gallerynpy.is_slide(slide):
             return None
         return slide[index]
@@ -530,7 +713,7 @@ class Handler(gallerynpy.Singleton):
         """
         if not name:
             return 0
-        slide_like = self.__current_slider[str(name)]
+        slide_like = self.__slide(str(name))
         return len(slide_like) if slide_like else 0
 
     def current_slide_size(self):
@@ -563,11 +746,32 @@ class Handler(gallerynpy.Singleton):
     def page_items(self):
         """
         Gets all buttons for the current page items on the current slide.
-        """
+
+        The buttons are built once and reused while the current slider, slide, page, distribution, borders,
+        thumbnails and the unlock state of the page items are the same.
+        """
+        items = tuple(self.current_item_at(index) for index in range(self.start, self.end + 1))
+        unlocked = tuple(item is not None and item.meets_condition for item in items)
+        # the borders are scaled again when their properties change, and the page must be built with the new ones
+        borders = (self.idle_res, self.play_idle_res, self.play_hover_res, self.locked_res)
+        key = (
+            id(self.__current_slider), self.__current_name, self.__page, self.rows, self.columns, self.start,
+            tuple(id(item) for item in items),
+            unlocked,
+            tuple(id(border) for border in borders),
+            # the thumbnails cache is cleared when a thumbnail property changes, and a custom thumbnail
+            # changes the source of the item thumbnail
+            gallerynpy.resources.thumbnails_cache.generation,
+            tuple(id(item.thumbnail.resource.resource) if meets else None for (item, meets) in zip(items, unlocked))
+        )
+        if self.__page_items is not None and self.__page_items[0] == key:
+            return self.__page_items[1]
+
         buttons = tuple(self.make_current_button_at(index) for index in range(self.start, self.end + 1))
         remains = tuple(Null() for _ in range(self.end - self.start + 1, self.max_per_page))
 
-        return buttons + remains
+        self.__page_items = (key, buttons + remains)
+        return self.__page_items[1]
 
     def back(self, from_animation_options=False):
         """
@@ -585,13 +789,100 @@ class Handler(gallerynpy.Singleton):
 
         return [Function(self.__release_gallery), to_first, Return(), Function(gallerynpy.db.save)]
 
+    def predict_items(self, depth: int = None) -> list[gallerynpy.Item]:
+        """
+        Gets the items that are likely to be displayed next.
+
+        They are the items of the previous and next pages of the current slide, and the ones of the first page
+        of the slides before and after the current one.
+        :param depth: The number of pages to take in each direction.
+            By default, is `gallerynpy.properties.prefetch_depth`.
+        :return: The items, from the nearest to the farthest.
+        """
+        if depth is None:
+            depth = gallerynpy.properties.prefetch_depth
+        depth = max(int(depth), 0)
+        per_page = self.max_per_page
+        if not depth or not per_page:
+            return []
+
+        items = []
+        slide = self.__slide(self.__current_name)
+        if gallerynpy.is_slide(slide):
+            for distance in range(1, depth + 1):
+                for page in (self.__page + distance, self.__page - distance):
+                    if page >= 0:
+                        end = min((page + 1) * per_page, slide.size)
+                        items.extend(slide[index] for index in range(page * per_page, end))
+
+        names = self.current_content_slides
+        if self.__current_name in names:
+            position = names.index(self.__current_name)
+            for name in names[max(position - depth, 0):position] + names[position + 1:position + depth + 1]:
+                neighbour = self.__current_slider[name]
+                if gallerynpy.is_slide(neighbour):
+                    items.extend(neighbour[index] for index in range(min(per_page, neighbour.size)))
+        return items
+
+    def predict_thumbnails(self, depth: int = None) -> list:
+        """
+        Gets the thumbnail displayables of the items that are likely to be displayed next.
+
+        See also `predict_items`
+        :param depth: The number of pages to take in each direction.
+            By default, is `gallerynpy.properties.prefetch_depth`.
+        :return: The thumbnail displayables.
+        """
+        thumbnails = []
+        for item in self.predict_items(depth):
+            if item is None or item.resource.is_none_type:
+                continue
+            try:
+                thumbnails.append(item.thumbnail.create())
+            except Exception:
+                continue
+        return thumbnails
+
+    def __stop_prediction(self):
+        """
+        Stops the prediction of the thumbnails started by `__predict`.
+        """
+        if self.__predicted:
+            renpy.stop_predict(*self.__predicted)
+        self.__predicted = ()
+        self.__predicted_key = None
+
+    def __predict(self):
+        """
+        Starts the prediction of the thumbnails of the items that are likely to be displayed next,
+        if the current slide, page or distribution changed since the last time.
+        """
+        key = (id(self.__search), id(self.__current_slider), self.__current_name, self.__page, self.rows, self.columns,
+               self.current_slide_size(), gallerynpy.properties.prefetch_depth)
+        if key == self.__predicted_key:
+            return
+
+        thumbnails = tuple(self.predict_thumbnails())
+        self.__stop_prediction()
+        if thumbnails:
+            renpy.start_predict(*thumbnails)
+        self.__predicted = thumbnails
+        self.__predicted_key = key
+
     def update(self):
         """
         Updates the current start and end index of the current page on the current slide.
+
+        It also starts the prediction of the thumbnails of the adjacent pages and slides.
+        See also `predict_items`
         """
         self.__init_gallery()
+        gallerynpy.resources.sizes_loader.merge()
+        self.register_pending()
+        self.__gallery.locked_button = self.locked_res
         self.__start = self.__page * self.max_per_page
         self.__end = min(self.start + self.max_per_page - 1, self.current_slide_size() - 1)
+        self.__predict()
 
 
 handler: Handler | None = None
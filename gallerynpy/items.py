@@ -28,6 +28,8 @@ The gallerynpy stored module.
 from store import gallerynpy
 """
 
+from store import python_object
+
 
 def is_item(obj):
     """
@@ -38,13 +40,17 @@ def is_item(obj):
     return isinstance(obj, Item)
 
 
-class Item:
+class Item(python_object):
     """
     Represents a single item in gallerynpy gallery.
+
+    It holds the resource and the thumbnail of the item, and the song, condition, tooltip and tags of its button.
     """
 
+    __slots__ = ("__name", "__resource", "__thumbnail", "__song", "__condition", "__tooltip", "__tags")
+
     def __init__(self, name: str, resource, size: gallerynpy.Size, song: str = None, condition: str = None,
-                 tooltip: str = None):
+                 tooltip: str = None, tags: list[str] | str = None):
         """
         :param name: The item name. Must be unique.
         :param resource: The resource of the item.
@@ -52,6 +58,7 @@ class Item:
         :param song: A valid filepath for an audio that renpy can load.
         :param condition: The condition to unlock the item.
         :param tooltip: The tooltip text to display when the item is hovered.
+        :param tags: The tags to search the item by.
         """
         self.name = name
         self.__resource = gallerynpy.resources.Resource(resource, gallerynpy.properties.force_loader)
@@ -59,6 +66,7 @@ class Item:
         self.song = song
         self.condition = condition
         self.tooltip = tooltip
+        self.tags = tags
 
     @property
     def resource(self):
@@ -108,6 +116,25 @@ class Item:
         """
         self.__tooltip = str(gallerynpy.or_default(tooltip, ""))
 
+    @property
+    def tags(self) -> tuple[str, ...]:
+        """
+        Gets the item tags.
+        """
+        return self.__tags
+
+    @tags.setter
+    def tags(self, tags: list[str] | str):
+        """
+        Sets the item tags.
+        :param tags: The new item tags. A single tag can be given as a string.
+        """
+        if tags is None:
+            tags = ()
+        elif not isinstance(tags, (list, tuple, set, frozenset)):
+            tags = (tags,)
+        self.__tags = tuple(str(tag) for tag in tags if tag)
+
     @property
     def song(self) -> str:
         """
@@ -66,6 +66,7 @@ class Properties(gallerynpy.Singleton):
         self.menu = gallerynpy.images_path("menu.png")
 
         self.thumbnails_folder = gallerynpy.images_path("gallerynpy", "thumbnails", from_renpy=True)
+        self.video_thumbnail_extensions = tuple('_thumbnail.' + item for item in ['jpg', 'png'])
 
         self.font_size = 20
         self.font = gallerynpy.join_path("gallerynpy", "fonts", "JetBrainsMono-Bold.ttf", for_renpy=True)
@@ -82,6 +83,7 @@ class Properties(gallerynpy.Singleton):
         self.sort_slides = False
         """
         If true, sorts the names (keys) of each slide/slider in the current slider before displaying them as options.
+        The names are sorted in natural order, e.g. `ch2` goes before `ch10`.
         
         Default is False.
         """
@@ -91,6 +93,14 @@ class Properties(gallerynpy.Singleton):
         Otherwise, when you exit the gallerynpy screen, the reference to the Gallery object will be removed (`del`) 
         to try to free up space, and it will be re-initialized when you return. 
         
+        Default is False.
+        """
+        self.keep_registry = False
+        """
+        If true and `keep_loaded` is false, the Gallery object is still removed when you exit the gallerynpy screen,
+        but the displayables created for its items are kept in a registry, and the Gallery object is rebuilt
+        from it when you return, without creating them again.
+        
         Default is False.
         """
         self.load_in_put = False
@@ -100,6 +110,41 @@ class Properties(gallerynpy.Singleton):
         
         Default is False.
         """
+        self.load_budget = None
+        """
+        If set along with `load_in_put`, the gallery items are loaded incrementally instead of all at once.
+        Each time the gallerynpy screen is updated, items are loaded for at most this number of seconds,
+        starting with the ones of the current slide, until all of them are loaded.
+        
+        Default is None.
+        """
+
+        self.warm_up_sizes = False
+        """
+        If true, the sizes of the images that are not in the db will be read in background once the game has started,
+        so they are not loaded while the gallery is displayed.
+        
+        Default is False.
+        """
+        self.warm_up_workers = 4
+        """
+        The maximum number of threads used to read the sizes when `warm_up_sizes` is true.
+        
+        Default is 4.
+        """
+
+        self.thumbnails_cache_capacity = 256
+        self.prescaled_thumbnails = False
+        self.atlas_thumbnails = False
+        self.prescaled_folder = gallerynpy.join_path("gallerynpy", "prescaled", for_renpy=True)
+        self.prefetch_depth = 1
+        """
+        The number of pages, before and after the current one, whose thumbnails are predicted (loaded in advance)
+        while the gallerynpy screen is displayed. The first page of the same number of slides before and after the
+        current one is also predicted. 0 disables it.
+        
+        Default is 1.
+        """
 
         self.rescale_images = True
         """
@@ -138,7 +183,20 @@ class Properties(gallerynpy.Singleton):
         Gets the thumbnail extensions accepted for automatically loading video element extensions.
         e.g. `_thumbnail.jpg`.
         """
-        return tuple('_thumbnail.' + item for item in ['jpg', 'png'])
+        return self.__video_thumbnail_extensions
+
+    @video_thumbnail_extensions.setter
+    def video_thumbnail_extensions(self, extensions):
+        """
+        Sets the thumbnail extensions accepted for automatically loading video element extensions.
+        :param extensions: The new extensions, in the order they are searched.
+        """
+        if extensions is None:
+            raise ValueError("Extensions cannot be None")
+        if isinstance(extensions, str):
+            extensions = (extensions,)
+        self.__video_thumbnail_extensions = tuple(str(extension) for extension in extensions)
+        gallerynpy.resources.forget_video_thumbnails()
 
     @property
     def not_found(self) -> gallerynpy.resources.Resource:
@@ -156,6 +214,7 @@ class Properties(gallerynpy.Singleton):
         :param displayable: The new resource for `not_found`
         """
         self.__not_found = self.__set_resource_attribute(self.__not_found, displayable)
+        gallerynpy.resources.thumbnails_cache.clear()
 
     @property
     def play_hover(self) -> gallerynpy.resources.Resource:
@@ -250,6 +309,67 @@ class Properties(gallerynpy.Singleton):
         if folder is None:
             raise ValueError("Folder cannot be None")
         self.__thumbnails_folder = str(folder)
+        gallerynpy.resources.forget_video_thumbnails()
+
+    @property
+    def prescaled_thumbnails(self) -> bool:
+        """
+        Gets if the thumbnails of the images are created from the files pre-scaled by the `thumbnails` build command
+        (see `prescaled_folder`), when present, instead of scaling the full size images.
+
+        Default is False.
+        """
+        return self.__prescaled_thumbnails
+
+    @prescaled_thumbnails.setter
+    def prescaled_thumbnails(self, prescaled: bool):
+        """
+        Sets if the thumbnails of the images are created from the pre-scaled files.
+        :param prescaled: The new value.
+        """
+        self.__prescaled_thumbnails = bool(prescaled)
+        gallerynpy.resources.thumbnails_cache.clear()
+
+    @property
+    def atlas_thumbnails(self) -> bool:
+        """
+        Gets if the thumbnails of the images are created from the crops of the atlas sheets written by the
+        `thumbnails` build command with the `--atlas` option, when present. The thumbnails of a page are then loaded
+        from one or a few sheets instead of one file each. It takes precedence over `prescaled_thumbnails`.
+
+        Default is False.
+        """
+        return self.__atlas_thumbnails
+
+    @atlas_thumbnails.setter
+    def atlas_thumbnails(self, atlas: bool):
+        """
+        Sets if the thumbnails of the images are created from the crops of the atlas sheets.
+        :param atlas: The new value.
+        """
+        self.__atlas_thumbnails = bool(atlas)
+        gallerynpy.resources.thumbnails_cache.clear()
+
+    @property
+    def prescaled_folder(self):
+        """
+        Gets the folder where the pre-scaled thumbnails are stored.
+
+        The thumbnail of `images/cg.png` with size `300x168` is searched as `<folder>/300x168/images/cg.png`.
+        """
+        return self.__prescaled_folder
+
+    @prescaled_folder.setter
+    def prescaled_folder(self, folder: str):
+        """
+        Sets the folder where the pre-scaled thumbnails are stored.
+        :param folder: The new folder path.
+        """
+        if folder is None:
+            raise ValueError("Folder cannot be None")
+        self.__prescaled_folder = str(folder)
+        gallerynpy.resources.atlases.clear()
+        gallerynpy.resources.thumbnails_cache.clear()
 
     @property
     def font_size(self):
@@ -591,6 +711,23 @@ class Properties(gallerynpy.Singleton):
         xsize = max(int(xsize), 5)
         self.__navigation_slides_bar_xsize = xsize
 
+    @property
+    def thumbnails_cache_capacity(self):
+        """
+        Gets the maximum number of thumbnail displayables kept in `gallerynpy.resources.thumbnails_cache`.
+        """
+        return gallerynpy.resources.thumbnails_cache.capacity
+
+    @thumbnails_cache_capacity.setter
+    def thumbnails_cache_capacity(self, capacity: int):
+        """
+        Sets the maximum number of thumbnail displayables kept in `gallerynpy.resources.thumbnails_cache`.
+
+        The cache is resized, so if the capacity is smaller, the least recently used thumbnails are discarded.
+        :param capacity: The new capacity value. The min is 0, which disables the cache.
+        """
+        gallerynpy.resources.thumbnails_cache.capacity = max(int(capacity), 0)
+
 
 properties: Properties | None = None
 """
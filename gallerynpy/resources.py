@@ -28,7 +28,11 @@ The gallerynpy.resources stored module.
 from store import gallerynpy
 """
 
-from store import Image, renpy, Composite, im
+import json
+import os
+import queue
+import threading
+from store import Image, renpy, Composite, Transform, im, python_object, python_dict
 
 try:
     displayable = renpy.display.displayable
@@ -191,11 +195,200 @@ class NamedResourcesLoader(gallerynpy.Singleton):
 named_resources_loader = NamedResourcesLoader()
 
 
-class Resource:
+class _SizesWork(python_object):
+    """
+    The work shared between the main thread and the threads of `SizesLoader`.
+
+    It holds the queue of the paths to read and the queue of the read sizes, with the count of the running threads.
+    The threads only read the sizes of the queued paths and queue the results, the main thread merges them.
+    """
+
+    def __init__(self, paths: list[str], workers: int):
+        self.paths = queue.Queue()
+        for path in paths:
+            self.paths.put(path)
+        self.results = queue.Queue()
+        self.workers = workers
+        self.lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        with self.lock:
+            return self.workers > 0
+
+    def work(self):
+        try:
+            while True:
+                try:
+                    path = self.paths.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    size = gallerynpy.dimensions.image_size(path)
+                except Exception:
+                    size = None
+                self.results.put((path, size))
+        finally:
+            with self.lock:
+                self.workers -= 1
+
+
+class SizesLoader(gallerynpy.Singleton):
+    """
+    A background loader for the sizes of image resources.
+
+    While the game is starting, every image resource whose size is not in `db` is put into it. Once `load` is called,
+    the sizes are read from the headers of the image files (see `gallerynpy.dimensions.image_size`) on a bounded
+    number of threads, so the gallery doesn't have to load them while it is displayed.
+
+    The threads don't change the resources or the `db`, the read sizes are put into them by `merge`,
+    which is called from the main thread when the gallery is updated.
+
+    It inherits from Singleton, so there will be only one instance of it.
+    """
+
+    def __init__(self):
+        self.__resources: list[Resource] = []
+        self.__collecting = True
+        self.__work = None
+        self.__waiting = {}
+        self.__total = 0
+        self.__done = 0
+
+    def push(self, resource: "Resource"):
+        """
+        Adds the resource to be loaded in the future.
+
+        It only accepts resources of type `IMAGE`, and only before the loader is started or cleared.
+        :param resource: The resource to be loaded
+        """
+        if self.__collecting and is_resource(resource) and resource.is_image_type:
+            self.__resources.append(resource)
+
+    @property
+    def total(self) -> int:
+        """
+        Gets the number of image files to read in the current load.
+        """
+        return self.__total
+
+    @property
+    def done(self) -> int:
+        """
+        Gets the number of image files already read and merged in the current load.
+        """
+        return self.__done
+
+    @property
+    def progress(self) -> float:
+        """
+        Gets the progress of the current load, from 0 to 1.
+        """
+        if not self.__total:
+            return 1.0
+        return float(self.__done) / self.__total
+
+    @property
+    def running(self) -> bool:
+        """
+        Checks if the loader threads are still running, or their sizes have not been merged yet.
+        """
+        return self.__work is not None
+
+    def load(self, workers: int = 4):
+        """
+        Starts reading the sizes of the pushed resources in background.
+
+        No more resources are accepted after it.
+        :param workers: The maximum number of threads to use.
+        """
+        self.__collecting = False
+        waiting = {}
+        for resource in self.__resources:
+            if resource.size is not None:
+                continue
+            try:
+                path = resource.get_image_file()
+            except Exception:
+                continue
+            if path:
+                resources = waiting.setdefault(path, [])
+                if resource not in resources:
+                    resources.append(resource)
+        self.__resources = []
+        if not waiting:
+            return
+
+        workers = max(1, min(int(workers), len(waiting)))
+        self.__waiting = waiting
+        self.__total = len(waiting)
+        self.__done = 0
+        self.__work = _SizesWork(list(waiting.keys()), workers)
+        for _ in range(workers):
+            renpy.invoke_in_thread(self.__work.work)
+
+    def merge(self) -> int:
+        """
+        Puts the sizes read by the threads so far into their resources and the `db`.
+
+        It must be called from the main thread.
+        :return: The number of image files merged.
+        """
+        work = self.__work
+        if work is None:
+            return 0
+
+        # the threads have finished only after queueing all their results
+        finished = not work.running
+        merged = 0
+        while True:
+            try:
+                path, size = work.results.get_nowait()
+            except queue.Empty:
+                break
+            merged += 1
+            for resource in self.__waiting.pop(path, ()):
+                if size is not None:
+                    resource.probe_size(path, size)
+
+        self.__done += merged
+        if finished:
+            self.__work = None
+            self.__waiting = {}
+        return merged
+
+    def clear(self):
+        """
+        Discards the pushed resources without loading them.
+
+        No more resources are accepted after it.
+        """
+        self.__collecting = False
+        self.__resources = []
+
+
+sizes_loader = SizesLoader()
+
+
+resolutions = gallerynpy.LRUCache(1024)
+"""
+The cache of the string resources (filepaths or image names) already resolved by `Resource.load`.
+Each one is mapped to its `(type, extension, size, db version)`.
+
+It keeps the most recently used ones, and its capacity can be changed.
+"""
+
+
+class Resource(python_object):
     """
     A helper to trait with resources such as images, videos, animations or displayable.
+
+    It resolves the type, extension and size of a filepath, image name or displayable,
+    and scales or composites it to a given size.
     """
 
+    __slots__ = ("__resource", "__type", "__extension", "__force_check", "__size")
+
     def __init__(self, resource, force_check: bool = False):
         """
         :param resource: The resource
@@ -233,6 +426,8 @@ class Resource:
                 elif gallerynpy.is_image(displayable):
                     self.__size = gallerynpy.db.get_size(self.resource, named=True)
                     self.__type = ResourceTypes.IMAGE
+                    if self.__size is None:
+                        sizes_loader.push(self)
                 elif is_displayable(displayable):
                     self.__type = ResourceTypes.DISPLAYABLE
                 else:
@@ -244,6 +439,9 @@ class Resource:
             else:
                 raise UnsupportedResourceTypeError(displayable)
 
+        if isinstance(self.resource, str) and self.__load_resolved():
+            return
+
         if isinstance(self.resource, str):
             def _is_loadable():
                 # checks if the file is loadable
@@ -255,15 +453,42 @@ class Resource:
                 _is_loadable()
                 self.__size = gallerynpy.db.get_size(self.resource)
                 self.__type = ResourceTypes.IMAGE
+                if self.__size is None:
+                    sizes_loader.push(self)
             elif self.__extension in Extensions.VIDEOS:
                 _is_loadable()
                 self.__type = ResourceTypes.VIDEO
             else:
                 self.__extension = None
                 image_like(gallerynpy.get_registered(self.resource), True)
+            if not self.is_none_type:
+                resolutions.put(self.resource, (self.__type, self.__extension, self.__size, gallerynpy.db.version))
         else:
             image_like(self.resource)
 
+    def __load_resolved(self) -> bool:
+        """
+        Loads the type, extension and size of the resource from `resolutions`.
+
+        The size is read again from `db` if it has changed since the resource was resolved.
+        :return: True if the resource was resolved before, False otherwise.
+        """
+        entry = resolutions.get(self.resource)
+        if entry is None:
+            return False
+
+        rtype, extension, size, version = entry
+        if rtype == ResourceTypes.IMAGE and version != gallerynpy.db.version:
+            version = gallerynpy.db.version
+            size = gallerynpy.db.get_size(self.resource, named=extension is None)
+            resolutions.put(self.resource, (rtype, extension, size, version))
+        self.__type = rtype
+        self.__extension = extension
+        self.__size = size
+        if rtype == ResourceTypes.IMAGE and size is None:
+            sizes_loader.push(self)
+        return True
+
     @property
     def resource(self):
         """
@@ -301,11 +526,9 @@ class Resource:
     def size(self):
         """
         Gets the size of the resource.
-        :return: Size object if the loaded resource was an image and its size was in `db`, otherwise None
+        :return: FrozenSize object if the loaded resource was an image and its size was in `db`, otherwise None
         """
-        if self.__size is None:
-            return None
-        return gallerynpy.Size.from_size(self.__size)
+        return self.__size
 
     @property
     def is_named(self):
@@ -370,9 +593,60 @@ class Resource:
 
         raise ResourceNoLoadableError(self.resource)
 
+    def get_image_file(self, image=None) -> str | None:
+        """
+        Gets the filepath of the image of the resource.
+
+        :param image: The image object of the resource. If not given, it is taken from `get_image`.
+        :return: The filepath if the resource is an image file, or an image (named or not) of a single file,
+            otherwise None.
+        :raises ResourceForbiddenOperationError: if the resource type is not `IMAGE`.
+        :raises ResourceNoLoadableError: If the resource filepath is not loadable.
+        """
+        if self.is_image_type and self.extension:
+            return self.resource
+
+        if image is None:
+            image = self.get_image()
+        filename = getattr(image, "filename", None)
+        if filename and gallerynpy.file_extension(filename) in Extensions.IMAGES:
+            return filename
+        return None
+
+    def probe_size(self, path: str = None, size: tuple[int, int] = None) -> bool:
+        """
+        Loads the image size of the resource from the header of its image file, without loading the image.
+
+        See also `gallerynpy.dimensions.image_size`
+        :param path: The image filepath. If not given, it is taken from `get_image_file`.
+        :param size: The (width, height) already read from the header, e.g. by the `SizesLoader` threads.
+        :return: True if the resource has a size, False otherwise.
+        :raises ResourceForbiddenOperationError: if the resource type is not `IMAGE`.
+        :raises ResourceNoLoadableError: If the resource filepath is not loadable.
+        """
+        if gallerynpy.is_size(self.__size):
+            return True
+
+        if size is None:
+            if path is None:
+                path = self.get_image_file()
+            size = gallerynpy.dimensions.image_size(path)
+        if size is None:
+            return False
+
+        self.__put_size(gallerynpy.FrozenSize.of(size[0], size[1]))
+        return True
+
+    def __put_size(self, size: gallerynpy.FrozenSize):
+        self.__size = size
+        gallerynpy.db.put_size(self.resource, size, named=self.is_named)
+
     def force_load_size(self):
         """
         Forces to load the image size of the resource.
+
+        The size is read from the header of the image file when possible (see `probe_size`),
+        otherwise the image is loaded to get it.
         :raises ResourceForbiddenOperationError: if the resource type is not `IMAGE`.
         :raises ResourceNoLoadableError: If the resource filepath is not loadable.
         """
@@ -380,15 +654,19 @@ class Resource:
             return
 
         image = self.get_image()
+        path = self.get_image_file(image)
+        if path and self.probe_size(path):
+            return
+
         width, height = image.load().get_size()
-        self.__size = gallerynpy.Size(width, height)
-        gallerynpy.db.put_size(self.resource, self.__size, named=self.is_named)
+        self.__put_size(gallerynpy.FrozenSize.of(width, height))
 
     def size_to(self, target: gallerynpy.Size):
         """
         Adjusts the current size to match the aspect ratio of the provided target size.
         :param target: The target size to match.
         :return: The adjusted size, or the target size if the resource doesn't have a `size`.
+            The adjusted size is a `FrozenSize`.
         :raises TypeError: If the target size is not a Size object.
         """
         if not gallerynpy.is_size(target):
@@ -402,9 +680,9 @@ class Resource:
         if self.__size == target or ratio == tratio:
             return target
         elif ratio > tratio:
-            return gallerynpy.Size(target.width, target.width / ratio)
+            return gallerynpy.FrozenSize.of(target.width, target.width / ratio)
 
-        return gallerynpy.Size(target.height * ratio, target.height)
+        return gallerynpy.FrozenSize.of(target.height * ratio, target.height)
 
     def scale_to(self, target: gallerynpy.Size):
         """
@@ -449,11 +727,15 @@ class Resource:
         return "<Resource of '{}' is '{}'>".format(self.resource, self.type)
 
 
-class Thumbnail:
+class Thumbnail(python_object):
     """
     Handles the creation of thumbnails for the different types of `Resource`.
+
+    It keeps the resource of an item, the custom resource that can replace it and the size of the thumbnail.
     """
 
+    __slots__ = ("__resource", "__custom", "__size")
+
     def __init__(self, resource: Resource | str, size: gallerynpy.Size):
         """
         :param resource: The resource object, or an object for instance the resource.
@@ -500,20 +782,114 @@ class Thumbnail:
         See also `Resource.composite_to`
 
         If the `resource` is not valid, the `gallerynpy.properties.not_found` resource will be used.
+
+        The created displayable is kept in `thumbnails_cache`, and reused for the same filepath or image name
+        (or displayable) of the `resource` and the same width and height of the `size`.
         """
         resource = self.resource
+        size = self.size
+        source = resource.resource
+        if isinstance(source, str):
+            key = (source if gallerynpy.is_renpy_path(source) else gallerynpy.normalize_path(source, for_renpy=True),
+                   size.width, size.height)
+        else:
+            # the entry keeps the displayable alive, so its id is not reused while it is cached
+            key = (id(source), size.width, size.height)
+        entry = thumbnails_cache.get(key)
+        if entry is not None and (entry[0] is source or isinstance(source, str)):
+            return entry[1]
+
+        thumbnail = self.__create(resource)
+        thumbnails_cache.put(key, (source, thumbnail))
+        return thumbnail
+
+    def __create(self, resource: Resource):
+        """
+        Create a thumbnail `displayable` for the given resource, without looking at the cache.
+        :param resource: The resource of the thumbnail.
+        """
         if resource.is_video_type and resource.extension:
-            for ext in gallerynpy.properties.video_thumbnail_extensions:
-                name = resource.resource.replace(resource.extension, ext)
-                path = gallerynpy.join_path(gallerynpy.properties.thumbnails_folder, name, for_renpy=True)
-                if gallerynpy.is_loadable(path):
-                    return Resource(path).composite_to(self.size)
+            path = video_thumbnails.get(resource.resource, False)
+            if path is False:
+                path = self.__video_thumbnail(resource)
+                video_thumbnails.put(resource.resource, path)
+            if path:
+                return Resource(path).composite_to(self.size)
             resource = gallerynpy.properties.not_found
+        elif resource.is_image_type and (gallerynpy.properties.prescaled_thumbnails or
+                                         gallerynpy.properties.atlas_thumbnails):
+            thumbnail = self.__prescaled(resource)
+            if thumbnail is not None:
+                return thumbnail
         elif not (resource.is_image_type or resource.is_displayable_type):
             resource = gallerynpy.properties.not_found
 
         return resource.composite_to(self.size)
 
+    def __prescaled(self, resource: Resource):
+        """
+        Creates a thumbnail `displayable` for the given image resource from its pre-scaled thumbnail.
+
+        The crop of the atlas sheet is used first, if `gallerynpy.properties.atlas_thumbnails` is true,
+        and then the pre-scaled file, if `gallerynpy.properties.prescaled_thumbnails` is true.
+        A named image uses the pre-scaled thumbnail of its image file.
+
+        See also `gallerynpy.properties.prescaled_folder`
+        :param resource: The image resource.
+        :return: The `Composite` object, or None if the resource has not a pre-scaled thumbnail.
+        """
+        path = resource.get_image_file()
+        if not path:
+            return None
+        size = self.size
+        folder = gallerynpy.join_path(gallerynpy.properties.prescaled_folder,
+                                      "{}x{}".format(size.width, size.height), for_renpy=True)
+        if gallerynpy.properties.atlas_thumbnails:
+            entry = load_atlas(folder).get(path)
+            if entry:
+                sheet, x, y, width, height = entry
+                image = Transform(gallerynpy.join_path(folder, sheet, for_renpy=True), crop=(x, y, width, height))
+                return Composite((size.width, size.height), (int(size.width / 2.0 - width / 2.0), 0), image)
+
+        if gallerynpy.properties.prescaled_thumbnails:
+            prescaled = gallerynpy.join_path(folder, path, for_renpy=True)
+            if gallerynpy.is_loadable(prescaled):
+                # the pre-scaled file fits in the thumbnail size as the original image does,
+                # so its size comes from the original image header, not from the pre-scaled file
+                resource.probe_size(path)
+                scaled = resource.size_to(size)
+                return Composite((size.width, size.height), (int(size.width / 2.0 - scaled.width / 2.0), 0),
+                                 prescaled)
+        return None
+
+    @staticmethod
+    def __video_thumbnail(resource: Resource):
+        """
+        Finds the thumbnail file of the given video resource in the thumbnails folder.
+        :param resource: The video resource.
+        :return: The path to the thumbnail file, or None if there is no thumbnail for the video.
+        """
+        candidates = []
+        for ext in gallerynpy.properties.video_thumbnail_extensions:
+            name = resource.resource.replace(resource.extension, ext)
+            candidates.append(gallerynpy.join_path(gallerynpy.properties.thumbnails_folder, name, for_renpy=True))
+
+        # the listed files are found with one lookup per stem, the others are checked (and remembered) one by one
+        unlisted = []
+        stems = {}
+        for path in candidates:
+            stem, extension = os.path.splitext(path)
+            if stem not in stems:
+                stems[stem] = gallerynpy.loadable_files.extensions(stem)
+            if extension in stems[stem]:
+                return path
+            if not stems[stem]:
+                unlisted.append(path)
+        for path in unlisted:
+            if gallerynpy.is_loadable(path):
+                return path
+        return None
+
     def set_custom(self, resource):
         """
         Set the given `resource` as custom.
@@ -531,3 +907,61 @@ class Thumbnail:
 
     def __repr__(self):
         return "<Thumbnail of {} with {}>".format(self.resource, self.size)
+
+
+thumbnails_cache = gallerynpy.LRUCache(256)
+"""
+The cache of the displayables created by `Thumbnail.create`, keyed by the filepath or image name of the resource
+(or its displayable) and the thumbnail width and height.
+
+Its capacity can be changed with `gallerynpy.properties.thumbnails_cache_capacity`.
+"""
+video_thumbnails = gallerynpy.LRUCache(256)
+"""
+The thumbnail files found for the video resources in `gallerynpy.properties.thumbnails_folder`, keyed by the video
+path. None means that the video has no thumbnail file.
+"""
+
+
+atlases = gallerynpy.LRUCache(8)
+"""
+The manifests of the thumbnail atlases read by `load_atlas`, keyed by their folder.
+"""
+
+
+def load_atlas(folder: str) -> dict:
+    """
+    Reads the manifest of the thumbnail atlas in the given folder, once.
+
+    The manifest (`atlas.json`) is written by the `thumbnails` build command with the `--atlas` option.
+    :param folder: The folder of the pre-scaled thumbnails of a size, e.g. `gallerynpy/prescaled/362x203`.
+    :return: The [sheet, x, y, width, height] of each image path. Empty if the folder has not a valid manifest.
+    """
+    manifest = atlases.get(folder)
+    if manifest is not None:
+        return manifest
+
+    manifest = python_dict()
+    path = gallerynpy.join_path(folder, "atlas.json", for_renpy=True)
+    if gallerynpy.is_loadable(path):
+        try:
+            with gallerynpy.open_game_file(path) as fs:
+                content = fs.read()
+            if isinstance(content, bytes):
+                content = content.decode("utf-8")
+            manifest = json.loads(content)
+        except (IOError, OSError, ValueError):
+            manifest = python_dict()
+        if not isinstance(manifest, dict):
+            manifest = python_dict()
+    atlases.put(folder, manifest)
+    return manifest
+
+
+def forget_video_thumbnails():
+    """
+    Forgets the thumbnail files found for the videos, and the thumbnails created with them.
+    Used when the thumbnails folder or the accepted extensions change.
+    """
+    video_thumbnails.clear()
+    thumbnails_cache.clear()
@@ -0,0 +1,135 @@
+# Copyright © 2023-2024, Yoimer Davila. <https://github.com/yoimerdr/gallerynpy>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import gallerynpy
+
+"""renpy
+init -3 python in gallerynpy:
+# docstring:1
+The gallerynpy stored module.
+from store import gallerynpy
+"""
+
+import re
+import bisect
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits the given text into the lowercase words used by `SearchIndex`.
+    :param text: The text to split.
+    :return: The words of the text. If the text is empty or None, an empty list.
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class SearchIndex(object):
+    """
+    An inverted index from words to gallerynpy items.
+
+    The items are indexed by the words of their tooltip, their tags and the names given when they are added,
+    such as the name of their slide.
+    """
+
+    def __init__(self):
+        self.__items = []
+        self.__keys = {}
+        self.__postings = {}
+        self.__tokens = []
+        self.__new_tokens = []
+
+    def add(self, item: gallerynpy.Item, *names: str):
+        """
+        Adds the given item to the index, or the new words of it if it was already added.
+        :param item: The item to add.
+        :param names: Other names to index the item by, e.g. the name of its slide.
+        """
+        if not gallerynpy.is_item(item):
+            return
+
+        words = set(tokenize(" ".join((item.tooltip,) + item.tags + tuple(str(name) for name in names))))
+
+        key = self.__keys.get(id(item))
+        if key is None:
+            key = self.__keys[id(item)] = len(self.__items)
+            self.__items.append(item)
+
+        for word in words:
+            posting = self.__postings.get(word)
+            if posting is None:
+                posting = self.__postings[word] = set()
+                self.__new_tokens.append(word)
+            posting.add(key)
+
+    def __matches(self, word: str) -> set:
+        """
+        Gets the keys of the items with any word that starts with the given one.
+        """
+        if self.__new_tokens:
+            self.__tokens.extend(self.__new_tokens)
+            self.__tokens.sort()
+            self.__new_tokens = []
+
+        tokens = self.__tokens
+        index = bisect.bisect_left(tokens, word)
+        postings = []
+        while index < len(tokens) and tokens[index].startswith(word):
+            postings.append(self.__postings[tokens[index]])
+            index += 1
+
+        if len(postings) == 1:
+            return postings[0]
+        return set().union(*postings)
+
+    def search(self, query: str) -> list[gallerynpy.Item]:
+        """
+        Searches the items that match every word of the given query.
+
+        A word of the query matches any indexed word that starts with it.
+        :param query: The text to search.
+        :return: The matching items, in the order they were added.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        matches = sorted((self.__matches(word) for word in set(words)), key=len)
+        keys = set(matches[0])
+        for other in matches[1:]:
+            if not keys:
+                break
+            keys.intersection_update(other)
+
+        items = self.__items
+        return [items[key] for key in sorted(keys)]
+
+    def __contains__(self, item):
+        return id(item) in self.__keys
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __repr__(self):
+        return "<SearchIndex with {} items and {} words>".format(len(self), len(self.__postings))
@@ -29,6 +29,8 @@ The gallerynpy stored module.
 from store import gallerynpy
 """
 
+import bisect
+
 
 def is_slide(obj):
     """
@@ -49,6 +51,44 @@ def is_slider(obj):
     return isinstance(obj, Slider)
 
 
+def walk_items(slide_like: "Slide | Slider"):
+    """
+    Walks over all the items of the given slide or slider, and of every slide in its nested sliders.
+
+    The walk is iterative, so it doesn't depend on the depth of the sliders, and goes depth-first
+    in the order the slides and sliders were put.
+    :param slide_like: The slide or slider to walk.
+    :return: A generator of `(path, slide, item)` tuples, where `path` is the tuple with the names from the given
+        slider to the slide of the item (empty if a slide is given).
+    """
+    if is_slide(slide_like):
+        for item in slide_like:
+            yield (), slide_like, item
+        return
+    if not is_slider(slide_like):
+        return
+
+    path = []
+    stack = [(slide_like, iter(slide_like.slides))]
+    while stack:
+        slider, names = stack[-1]
+        name = next(names, None)
+        if name is None:
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+
+        child = slider.get(name)
+        if is_slider(child):
+            path.append(name)
+            stack.append((child, iter(child.slides)))
+        elif is_slide(child) and child.size:
+            child_path = tuple(path) + (name,)
+            for item in child:
+                yield child_path, child, item
+
+
 class SlideLike(object):
     """
     The base class for the slides and sliders.
@@ -105,6 +145,16 @@ class SlideLike(object):
         elif is_slider(parent):
             self._parent = parent
 
+    def _grow(self, count: int = 1):
+        """
+        Increases the size, notifying the parent `Slider` when it stops being empty.
+        :param count: The number of items added.
+        """
+        empty = not self._size
+        self._size += count
+        if empty and self._size and self._parent is not None:
+            self._parent._child_filled(self)
+
     def clone(self, name: str = None, include_parent: bool = False) -> "SlideLike":
         raise NotImplementedError("Must be implemented in child")
 
@@ -153,13 +203,92 @@ class Slider(SlideLike):
         """
         super(Slider, self).__init__(name, parent)
         self._items = {}
+        self.__slides = None
+        self.__sorted_keys = []
+        self.__sorted_names = []
+        self.__sorted_slides = None
+        self.__first_slides = {}
+        self.__filled = set()
+        self.__content_slides = None
+        self.__sorted_content_slides = None
+
+    @property
+    def slides(self) -> tuple[str, ...]:
+        """
+        Gets all the names of the slider items, in the order they were put.
+
+        The tuple is built once and reused until another item is put.
+        """
+        if self.__slides is None:
+            self.__slides = tuple(self._items)
+        return self.__slides
 
     @property
-    def slides(self) -> list[str]:
+    def sorted_slides(self) -> tuple[str, ...]:
+        """
+        Gets all the names of the slider items, in natural order.
+
+        See also `gallerynpy.natural_key`
+
+        The order is kept as the items are put, and the tuple is built once and reused until another item is put.
         """
-        Gets all the names of the slider items.
+        if self.__sorted_slides is None:
+            self.__sorted_slides = tuple(self.__sorted_names)
+        return self.__sorted_slides
+
+    def first_slide(self, sort: bool = False, skip_animations: bool = False) -> str | None:
+        """
+        Gets the name of the first `Slide` in the slider items.
+
+        The result is kept until another item is put.
+        :param sort: If true, the items are taken in natural order, otherwise in the order they were put.
+        :param skip_animations: If true, the slides marked as one for animations are skipped.
+        :return: The name of the first slide, or None if there is no one.
         """
-        return list(self._items.keys())
+        key = (bool(sort), bool(skip_animations))
+        if key in self.__first_slides:
+            return self.__first_slides[key]
+
+        first = None
+        for name in (self.__sorted_names if sort else self._items):
+            slide = self._items[name]
+            if is_slide(slide) and not (skip_animations and slide.is_for_animations):
+                first = name
+                break
+        self.__first_slides[key] = first
+        return first
+
+    @property
+    def content_slides(self) -> tuple[str, ...]:
+        """
+        Gets the names of the slider items that are not empty, in the order they were put.
+
+        The non-empty items are tracked as they grow, and the tuple is built once and reused until that changes.
+        """
+        if self.__content_slides is None:
+            self.__content_slides = tuple(name for name in self.slides if name in self.__filled)
+        return self.__content_slides
+
+    @property
+    def sorted_content_slides(self) -> tuple[str, ...]:
+        """
+        Gets the names of the slider items that are not empty, in natural order.
+
+        See also `Slider.content_slides`
+        """
+        if self.__sorted_content_slides is None:
+            self.__sorted_content_slides = tuple(name for name in self.__sorted_names if name in self.__filled)
+        return self.__sorted_content_slides
+
+    def _child_filled(self, item: SlideLike):
+        """
+        Marks the given item as not empty, if it is one of the slider items.
+        :param item: The item that stopped being empty.
+        """
+        if self._items.get(item.name) is item and item.name not in self.__filled:
+            self.__filled.add(item.name)
+            self.__content_slides = None
+            self.__sorted_content_slides = None
 
     def clone(self, name: str = None, include_parent: bool = False) -> "Slider":
         """
@@ -174,14 +303,25 @@ class Slider(SlideLike):
 
         for item in map(lambda key: self.get(key).clone(), self.slides):
             item.parent = slider
-            slider._items[item.name] = item
+            slider._put(item)
 
         return slider
 
     def _put(self, item: SlideLike):
-        if item.name not in self.slides:
+        if item.name not in self._items:
             self._items[item.name] = item
-            self._size += 1
+            self.__slides = None
+            key = gallerynpy.natural_key(item.name)
+            index = bisect.bisect_right(self.__sorted_keys, key)
+            self.__sorted_keys.insert(index, key)
+            self.__sorted_names.insert(index, item.name)
+            self.__sorted_slides = None
+            self.__first_slides.clear()
+            if item.size:
+                self.__filled.add(item.name)
+                self.__content_slides = None
+                self.__sorted_content_slides = None
+            self._grow()
             return True
         return False
 
@@ -207,10 +347,7 @@ class Slider(SlideLike):
         if identifier is None:
             return None
 
-        identifier = str(identifier)
-        if identifier in self.slides:
-            return self._items[identifier]
-        return None
+        return self._items.get(str(identifier))
 
     def create_slide(self, name: str, is_for_animations: bool = False) -> "Slide":
         """
@@ -239,7 +376,7 @@ class Slider(SlideLike):
     def __contains__(self, item):
         if not item:
             return False
-        return item in self.slides
+        return item in self._items
 
     def __iter__(self):
         if self._items:
@@ -293,10 +430,23 @@ class Slide(SlideLike):
         """
         if gallerynpy.is_item(item):
             self._items.append(item)
-            self._size += 1
+            self._grow()
             return True
         return False
 
+    def extend(self, items: typing.Iterable[gallerynpy.Item]) -> int:
+        """
+        Adds the valid `Item`s to the slide.
+        :param items: The items to be added.
+        :return: The number of items added.
+        """
+        items = [item for item in items if gallerynpy.is_item(item)]
+        if not items:
+            return 0
+        self._items.extend(items)
+        self._grow(len(items))
+        return len(items)
+
     def get(self, identifier: int) -> gallerynpy.Item | None:
         """
         Gets the `Item` with the given identifier.
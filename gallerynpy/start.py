@@ -32,5 +32,6 @@ init 9999 python:
 gallerynpy.properties.force_loader = True
 gallerynpy.init()
 gallerynpy.load_named_resources()
+gallerynpy.warm_up_sizes()
 gallerynpy.db.save()
 gallerynpy.to_first_slide(gallerynpy.properties.sort_slides)
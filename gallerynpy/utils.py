@@ -28,6 +28,7 @@ The gallerynpy stored module.
 import os
 import re
 import errno
+from collections import OrderedDict
 from store import renpy, config
 
 RENPY_SEP = "/"
@@ -47,6 +48,121 @@ class Singleton(object):
         return cls._instances[cls]
 
 
+class LRUCache(object):
+    """
+    A bounded mapping that discards the least recently used entries when it is full.
+
+    It counts the hits and misses of its lookups, so its capacity can be tuned.
+    """
+
+    def __init__(self, capacity: int = 128):
+        """
+        :param capacity: The maximum number of entries. If it is 0 or less, nothing will be stored.
+        """
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__generation = 0
+        self.capacity = capacity
+
+    @property
+    def capacity(self) -> int:
+        """
+        Gets the maximum number of entries.
+        """
+        return self.__capacity
+
+    @capacity.setter
+    def capacity(self, capacity: int):
+        """
+        Sets the maximum number of entries, discarding the least recently used ones that no longer fit.
+        :param capacity: The new maximum number of entries.
+        """
+        self.__capacity = max(0, int(capacity))
+        self.__shrink()
+
+    @property
+    def hits(self) -> int:
+        """
+        Gets the number of lookups that found its entry.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Gets the number of lookups that did not find its entry.
+        """
+        return self.__misses
+
+    @property
+    def generation(self) -> int:
+        """
+        Gets the number of times the cache was cleared.
+
+        It can be used to know if something built from the entries got before may be outdated.
+        """
+        return self.__generation
+
+    def __shrink(self):
+        while len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    def get(self, key, default=None):
+        """
+        Gets the value of the given key, marking it as the most recently used.
+        :param key: The key of the entry.
+        :param default: The value to return if the key is not found.
+        :return: The value of the key, or the default value.
+        """
+        try:
+            value = self.__entries.pop(key)
+        except KeyError:
+            self.__misses += 1
+            return default
+        self.__entries[key] = value
+        self.__hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Puts the given value for the key as the most recently used entry.
+        :param key: The key of the entry.
+        :param value: The value of the entry.
+        """
+        self.__entries.pop(key, None)
+        if self.__capacity > 0:
+            self.__entries[key] = value
+            self.__shrink()
+
+    def discard(self, key):
+        """
+        Removes the entry of the given key, if it exists.
+        :param key: The key of the entry.
+        """
+        self.__entries.pop(key, None)
+
+    def clear(self, stats: bool = False):
+        """
+        Removes all the entries.
+        :param stats: If true, the hits and misses are also reset.
+        """
+        self.__entries.clear()
+        self.__generation += 1
+        if stats:
+            self.__hits = 0
+            self.__misses = 0
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __repr__(self):
+        return "<LRUCache {}/{} hits={} misses={}>".format(len(self), self.capacity, self.hits, self.misses)
+
+
 def or_default(obj, default=None):
     """
     Checks if `obj` is not None and returns it.
@@ -96,6 +212,49 @@ def file(path: str, mode: str = "r", encoding: str = "utf-8", from_game: bool =
     return open(path, mode, encoding=encoding)
 
 
+def replace_file(path: str, data: bytes, backup: str = None):
+    """
+    Replaces the contents of the file at the given path atomically.
+
+    The data is written into a temporary file, flushed to the disk and then renamed to the path,
+    so the file has either its previous contents or the new ones, but never a truncated one.
+    :param path: The absolute path to the file.
+    :param data: The new contents of the file.
+    :param backup: If given, the absolute path where the previous file is kept.
+    """
+    path = str(path)
+    temp = path + ".tmp"
+
+    def rename(source: str, target: str):
+        if hasattr(os, "replace"):
+            return os.replace(source, target)
+        if os.path.exists(target):
+            os.remove(target)
+        os.rename(source, target)
+
+    with open(temp, "wb") as fs:
+        fs.write(data)
+        fs.flush()
+        os.fsync(fs.fileno())
+
+    if backup and os.path.isfile(path):
+        rename(path, str(backup))
+    rename(temp, path)
+
+
+def open_game_file(path: str):
+    """
+    Opens a file of the game for reading in binary mode, with the renpy loader,
+    so the files inside the rpa archives are found too.
+
+    `renpy.file` is the name of `renpy.open_file` in older versions of renpy.
+    :param path: The renpy path to the file.
+    :return: The opened file.
+    """
+    opener = getattr(renpy, "open_file", None) or renpy.file
+    return opener(str(path))
+
+
 def get_registered(name: str):
     """
     Gets the registered image (simple or animation like) in the game.
@@ -179,6 +338,35 @@ def normalize_path(path: str, for_renpy: bool = False):
     return path
 
 
+def is_renpy_path(path: str):
+    """
+    Checks if the given path is already in the normalized form used by renpy.
+
+    That is, the path that `normalize_path` would return with `for_renpy` as `True`. The check is conservative,
+    some normalized paths may not pass it, but a path that passes it does not need to be normalized.
+    :param path: The path to check.
+    :return: True if the path can be used without normalizing it, False otherwise.
+    """
+    if not path or path[0] == "." or path[-1] in "/.":
+        return False
+    return "\\" not in path and "//" not in path and "./" not in path
+
+
+def natural_key(text: str):
+    """
+    Gets the key to sort the given text in natural order, where the numbers are compared by their value
+    and the letters regardless of their case. e.g. `ch2` goes before `ch10`.
+
+    :param text: The text to get its key.
+    :return: A `(chunks, text)` tuple. The chunks are the lowercase text chunks and the numbers of the text,
+        alternating and always starting with a text chunk. The text itself breaks the ties between texts
+        that only differ in the case of their letters or in the zero padding of their numbers, e.g. `a01` and `a1`.
+    """
+    text = str(text)
+    chunks = re.split(r"(\d+)", text)
+    return tuple(int(chunk) if index % 2 else chunk.lower() for (index, chunk) in enumerate(chunks)), text
+
+
 def images_path(first: str, *args, **kwargs):
     """
     Join the given paths to the `gallerynpy` or game `images` folder.
@@ -196,11 +384,82 @@ def images_path(first: str, *args, **kwargs):
     return join_path("gallerynpy", "images", first, *args, for_renpy=True)
 
 
+class LoadableFiles(object):
+    """
+    An index of the files that renpy can load, built once from `renpy.list_files`.
+
+    It keeps the set of the file paths, and the extensions found for each path without extension (stem).
+    The paths that are not in the listing (e.g. from other search paths) are checked with `renpy.loadable`
+    and the result is remembered, until the index is refreshed.
+    """
+
+    def __init__(self):
+        self.__files = None
+        self.__stems = None
+        self.__checked = {}
+
+    def refresh(self):
+        """
+        Builds the index again from the current `renpy.list_files`.
+        """
+        files = set()
+        stems = {}
+        for path in renpy.list_files():
+            path = str(path)
+            files.add(path)
+            stem, extension = os.path.splitext(path)
+            stems.setdefault(stem, []).append(extension)
+        self.__files = files
+        self.__stems = dict((stem, tuple(extensions)) for (stem, extensions) in stems.items())
+        self.__checked = {}
+
+    def __ensure(self):
+        if self.__files is None:
+            self.refresh()
+
+    @staticmethod
+    def __normalize(path: str) -> str:
+        path = str(path)
+        return path if is_renpy_path(path) else normalize_path(path, for_renpy=True)
+
+    def extensions(self, stem: str) -> tuple[str, ...]:
+        """
+        Gets the extensions of the listed files with the given path without extension.
+        :param stem: The path without extension, e.g. `images/cg`.
+        :return: The extensions, e.g. `('.png', '.jpg')`, or an empty tuple if there is no such file.
+        """
+        self.__ensure()
+        return self.__stems.get(self.__normalize(stem), ())
+
+    def __contains__(self, path):
+        if not path:
+            return False
+        self.__ensure()
+        path = self.__normalize(path)
+        if path in self.__files:
+            return True
+
+        loadable = self.__checked.get(path)
+        if loadable is None:
+            loadable = self.__checked[path] = bool(renpy.loadable(path))
+        return loadable
+
+    def __len__(self):
+        self.__ensure()
+        return len(self.__files)
+
+
+loadable_files = LoadableFiles()
+"""
+The index of the loadable files used by `is_loadable`.
+"""
+
+
 def is_loadable(path: str, extensions: tuple | list[str] | None = None):
     """
     Checks if the given path is loadable.
 
-    See also `renpy.loadable`
+    See also `renpy.loadable` and `LoadableFiles`
     :param path: The path to the file.
     :param extensions: Extensions with which the path should end.
     :return: True if the path is loadable and ends with extensions (if present), False otherwise
@@ -212,7 +471,7 @@ def is_loadable(path: str, extensions: tuple | list[str] | None = None):
     if extensions and not path.endswith(extensions):
         return False
 
-    return renpy.loadable(path)
+    return path in loadable_files
 
 
 def is_image(obj):
@@ -297,3 +556,20 @@ def width_ratio(ratio: float) -> int:
     :return: The calculated width
     """
     return int(config.screen_width * ratio)
+
+
+def thumbnail_dimensions(columns: int, rows: int, width: float, spacing: float, aspect_ratio: float) -> tuple[int, int]:
+    """
+    Calculates the dimensions of the thumbnails for the given distribution on each page.
+
+    The thumbnails fill the given width, separated by the spacing, and keep the given aspect ratio.
+    :param columns: The number of columns in the page.
+    :param rows: The number of rows in the page.
+    :param width: The width available for the items.
+    :param spacing: The xspacing between each item.
+    :param aspect_ratio: The aspect ratio of the thumbnails, usually the one of the game screen.
+    :return: The (width, height) tuple.
+    """
+    target = max(columns, rows)
+    width = (width - spacing * (target - 1)) / float(target)
+    return int(width), int(width / aspect_ratio)
@@ -0,0 +1,120 @@
+import concurrent.futures
+import json
+import os
+import pathlib
+from PIL import Image
+from . import sizes
+
+SHEET_SIZE = 2048
+MANIFEST = "atlas.json"
+SHEETS = "atlas"
+
+
+def shelf_pack(rectangles: list[tuple[int, int]], sheet_size: int = SHEET_SIZE) -> list[tuple[int, int, int]]:
+    """
+    Places the given rectangles into square sheets, filling each one by rows (shelves) from top to bottom.
+
+    The rectangles are placed in the given order, so it is better to give them sorted by height.
+    :param rectangles: The (width, height) of each rectangle. None of them can be larger than the sheet.
+    :param sheet_size: The width and height of each sheet.
+    :return: The (sheet, x, y) position of each rectangle.
+    """
+    positions = []
+    sheet = x = y = shelf = 0
+    for (width, height) in rectangles:
+        if x + width > sheet_size:
+            x = 0
+            y += shelf
+            shelf = 0
+        if y + height > sheet_size:
+            sheet += 1
+            x = y = shelf = 0
+        positions.append((sheet, x, y))
+        x += width
+        shelf = max(shelf, height)
+    return positions
+
+
+def pack_group(task: tuple[str, str, list[str], int]) -> dict:
+    """
+    Packs the thumbnails of a group into sheets and writes them.
+    :param task: The (folder, prefix, keys, sheet_size) tuple. The keys are the paths of the thumbnails,
+        relative to the folder, and the sheets are written as `<folder>/atlas/<prefix>_<n>.png`.
+    :return: The manifest entries of the group, with the [sheet, x, y, width, height] of each key.
+    """
+    folder, prefix, keys, sheet_size = task
+    images = []
+    for key in keys:
+        try:
+            image = Image.open(os.path.join(folder, key))
+            image.load()
+        except (IOError, OSError, ValueError):
+            continue
+        if image.width <= sheet_size and image.height <= sheet_size:
+            images.append((key, image))
+        else:
+            image.close()
+
+    images.sort(key=lambda item: (-item[1].height, item[0]))
+    positions = shelf_pack([image.size for (_, image) in images], sheet_size)
+
+    sheets = {}
+    heights = {}
+    entries = {}
+    for ((key, image), (sheet, x, y)) in zip(images, positions):
+        if sheet not in sheets:
+            sheets[sheet] = Image.new("RGBA", (sheet_size, sheet_size), (0, 0, 0, 0))
+        sheets[sheet].paste(image.convert("RGBA"), (x, y))
+        heights[sheet] = max(heights.get(sheet, 0), y + image.height)
+        name = "{}/{}_{}.png".format(SHEETS, prefix, sheet)
+        entries[pathlib.PurePath(key).as_posix()] = [name, x, y, image.width, image.height]
+        image.close()
+
+    os.makedirs(os.path.join(folder, SHEETS), exist_ok=True)
+    for (sheet, image) in sheets.items():
+        # the unused rows below the last shelf are not kept
+        image = image.crop((0, 0, sheet_size, heights[sheet]))
+        image.save(os.path.join(folder, SHEETS, "{}_{}.png".format(prefix, sheet)))
+    return entries
+
+
+def pack(folder: str, sheet_size: int = SHEET_SIZE, workers: int = None, force: bool = False) -> tuple[int, int]:
+    """
+    Packs the pre-scaled thumbnails of a size folder (e.g. `gallerynpy/prescaled/362x203`) into atlas sheets.
+
+    The thumbnails are grouped by the folder of their image, so the items of a slide usually share the same sheets.
+    The sheets are written into the `atlas` folder, and the position of each thumbnail into the `atlas.json` manifest,
+    which is what `Thumbnail` reads when `gallerynpy.properties.atlas_thumbnails` is true.
+    The atlas is not written again if the manifest is newer than all the thumbnails.
+    :param folder: The size folder, with the thumbnails written by `generation.thumbnails.generate`.
+    :param sheet_size: The maximum width and height of each sheet.
+    :param workers: The number of processes to pack the groups with. By default, the number of cpus.
+    :param force: If true, the atlas is written even if the manifest is up to date.
+    :return: A tuple with the number of thumbnails and the number of sheets written.
+    """
+    folder = pathlib.Path(folder)
+    manifest = folder / MANIFEST
+    groups = {}
+    latest = 0
+    for path in sizes.find_images(folder, "."):
+        key = path.relative_to(folder)
+        if key.parts[0] == SHEETS:
+            continue
+        latest = max(latest, path.stat().st_mtime_ns)
+        groups.setdefault(key.parent.as_posix(), []).append(str(key))
+
+    total = sum(len(keys) for keys in groups.values())
+    if not force and manifest.is_file() and manifest.stat().st_mtime_ns >= latest:
+        return total, 0
+
+    for sheet in (folder / SHEETS).glob("*.png"):
+        sheet.unlink()
+
+    tasks = [(str(folder), str(index), keys, sheet_size) for (index, (_, keys)) in enumerate(sorted(groups.items()))]
+    entries = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for group in executor.map(pack_group, tasks):
+            entries.update(group)
+
+    manifest.write_text(json.dumps(entries, sort_keys=True), encoding="utf-8")
+    return total, len(set(entry[0] for entry in entries.values()))
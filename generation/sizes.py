@@ -0,0 +1,105 @@
+import concurrent.futures
+import json
+import os
+import pathlib
+import struct
+from . import stored
+
+dimensions = stored.load_module("dimensions")
+gallerynpy = stored.load_stored("db")
+
+IMAGES = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def probe_file(path: str) -> tuple[int, int] | None:
+    """
+    Reads the dimensions of the image at the given path from its header.
+    :param path: The absolute path to the image.
+    :return: The (width, height) tuple, or None if the header is not valid.
+    """
+    try:
+        with open(path, "rb") as fs:
+            return dimensions.probe(fs)
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+
+def find_images(game: pathlib.Path, folder: str = "images") -> list[pathlib.Path]:
+    """
+    Finds all the image files under the given folder of the game.
+    :param game: The game folder.
+    :param folder: The folder to walk, relative to the game folder.
+    :return: The paths to the images.
+    """
+    return sorted(path for path in (game / folder).rglob("*") if path.suffix.lower() in IMAGES and path.is_file())
+
+
+def load_cache(path: pathlib.Path) -> dict:
+    if not path.is_file():
+        return {}
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def precompute(game: str, output: str = None, folder: str = "images", workers: int = None) -> tuple[int, int]:
+    """
+    Precomputes the dimensions of the images in the given game folder and writes them into the gallerynpy db file.
+
+    The probed files are remembered, by modification time and size, in a cache next to the db file
+    (hidden, so renpy doesn't distribute it), and only new or changed files are probed again.
+    The db file is written again with only the images found in this run.
+    :param game: The game folder (the one with the renpy scripts).
+    :param output: The db file, relative to the game folder. The storage is chosen from its extension.
+        By default, `gallerynpy/db/images.json`.
+    :param folder: The folder with the images, relative to the game folder.
+    :param workers: The number of processes to probe the images with. By default, the number of cpus.
+    :return: A tuple with the number of images and the number of them that were probed.
+    """
+    game = pathlib.Path(game).resolve()
+    output = game / (output or os.path.join("gallerynpy", "db", "images.json"))
+    cache_path = output.with_name("." + output.name + ".cache")
+
+    cache = load_cache(cache_path)
+    images = find_images(game, folder)
+    current = {}
+    changed = []
+    for image in images:
+        stat = image.stat()
+        key = image.relative_to(game).as_posix()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(key)
+        if entry and entry[:2] == stamp:
+            current[key] = entry
+        else:
+            current[key] = stamp + [0, 0]
+            changed.append(key)
+
+    if changed:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = [str(game / key) for key in changed]
+            for (key, size) in zip(changed, executor.map(probe_file, paths, chunksize=64)):
+                if size is not None:
+                    current[key][2:] = size
+
+    if changed or set(cache.keys()) != set(current.keys()) or not output.is_file():
+        storage_type = gallerynpy.SizesDb.STORAGES.get(output.suffix, gallerynpy.JsonSizesStorage)
+        # the previous file is not loaded, so the sizes of deleted or renamed images are not kept
+        storage = storage_type(str(output))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        oversized = storage.write(dict((key, tuple(entry[2:])) for (key, entry) in current.items()
+                                       if entry[2] and entry[3]))
+        storage.close()
+        # the sizes the storage cannot hold are shipped in its journal, as the db does on the player side
+        journal = gallerynpy.SizesJournal(storage.source + gallerynpy.SizesJournal.EXTENSION)
+        journal.clear()
+        if oversized:
+            journal.append(oversized)
+        # the backup is only useful on the player side
+        if os.path.isfile(storage.backup):
+            os.remove(storage.backup)
+        cache_path.write_text(json.dumps(current), encoding="utf-8")
+
+    return len(images), len(changed)
@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import sys
+import types
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gallerynpy")
+
+
+def load_module(name: str, namespace: types.ModuleType = None) -> types.ModuleType:
+    """
+    Loads a gallerynpy module from its source file, without importing the gallerynpy package.
+
+    Importing the package runs its renpy init code (e.g. the creation and save of the db), which must not be run
+    outside the game.
+    :param name: The module name, e.g. `dimensions`
+    :param namespace: The module used as `gallerynpy` while the module is executed. If not given, an empty one is used.
+    :return: The loaded module.
+    """
+    spec = importlib.util.spec_from_file_location("gallerynpy_" + name, os.path.join(SOURCE, name + ".py"))
+    module = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get("gallerynpy")
+    sys.modules["gallerynpy"] = namespace if namespace is not None else types.ModuleType("gallerynpy")
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        if previous is None:
+            del sys.modules["gallerynpy"]
+        else:
+            sys.modules["gallerynpy"] = previous
+    return module
+
+
+def load_stored(*names: str) -> types.ModuleType:
+    """
+    Loads the given modules of the `gallerynpy` stored module into a single namespace, as renpy does.
+
+    The `utils` module is always loaded first.
+    :param names: The module names, e.g. `db`
+    :return: The namespace with the contents of all the modules.
+    """
+    namespace = types.ModuleType("gallerynpy")
+    for name in ("utils",) + tuple(name for name in names if name != "utils"):
+        module = load_module(name, namespace)
+        for (key, value) in vars(module).items():
+            if not key.startswith("__"):
+                setattr(namespace, key, value)
+    return namespace
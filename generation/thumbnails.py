@@ -0,0 +1,102 @@
+import concurrent.futures
+import os
+import pathlib
+from PIL import Image
+from . import sizes
+from . import stored
+
+gallerynpy = stored.load_stored()
+
+DISTRIBUTIONS = ((4, 4),)
+
+# the layout defaults of gallerynpy.properties, as ratios of the screen width
+NAVIGATION_XSIZE_RATIO = 0.21875
+NAVIGATION_SPACING_RATIO = 0.00390625
+ITEM_XSPACING_RATIO = 0.0078125
+
+
+def thumbnail_sizes(screen: tuple[int, int], distributions=DISTRIBUTIONS, navigation: int = None,
+                    spacing: int = None) -> list[tuple[int, int]]:
+    """
+    Calculates the thumbnail sizes that the gallery uses for the given distributions.
+
+    See also `gallerynpy.thumbnail_dimensions`
+    :param screen: The (width, height) of the game screen.
+    :param distributions: The (columns, rows) distributions on each page.
+    :param navigation: The width of the navigation section plus its spacing. By default, the one of the properties.
+    :param spacing: The xspacing between each item. By default, the one of the properties.
+    :return: The distinct (width, height) sizes.
+    """
+    width, height = screen
+    if navigation is None:
+        navigation = int(width * NAVIGATION_XSIZE_RATIO) + int(width * NAVIGATION_SPACING_RATIO)
+    if spacing is None:
+        spacing = int(width * ITEM_XSPACING_RATIO)
+
+    found = []
+    for (columns, rows) in distributions:
+        size = gallerynpy.thumbnail_dimensions(columns, rows, width - navigation, spacing, width / float(height))
+        if size not in found:
+            found.append(size)
+    return found
+
+
+def render(task: tuple[str, str, int, int]) -> bool:
+    """
+    Writes the scaled down copy of an image, keeping its aspect ratio, that fits in the given size.
+    :param task: The (source, target, width, height) tuple.
+    :return: True if the copy was written, False if the source could not be read.
+    """
+    source, target, width, height = task
+    try:
+        with Image.open(source) as image:
+            image.thumbnail((width, height), Image.LANCZOS)
+            if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA")
+            if target.lower().endswith((".jpg", ".jpeg")) and image.mode != "RGB":
+                image = image.convert("RGB")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            image.save(target)
+    except (IOError, OSError, ValueError):
+        return False
+    return True
+
+
+def generate(game: str, screen: tuple[int, int] = (1920, 1080), distributions=DISTRIBUTIONS,
+             output: str = None, folder: str = "images", workers: int = None) -> tuple[int, int]:
+    """
+    Generates the pre-scaled thumbnails of the images in the given game folder.
+
+    Each image is written, with its path relative to the game folder, into a folder named by the thumbnail size,
+    e.g. `gallerynpy/prescaled/300x168/images/cg.png`, which is where `Thumbnail` searches for it when
+    `gallerynpy.properties.prescaled_thumbnails` is true. The thumbnails newer than their image are not written again.
+    :param game: The game folder (the one with the renpy scripts).
+    :param screen: The (width, height) of the game screen.
+    :param distributions: The (columns, rows) distributions on each page.
+    :param output: The folder of the thumbnails, relative to the game folder. By default, `gallerynpy/prescaled`.
+    :param folder: The folder with the images, relative to the game folder.
+    :param workers: The number of processes to scale the images with. By default, the number of cpus.
+    :return: A tuple with the number of thumbnails and the number of them that were written.
+    """
+    game = pathlib.Path(game).resolve()
+    output = game / (output or os.path.join("gallerynpy", "prescaled"))
+
+    targets = thumbnail_sizes(screen, distributions)
+    tasks = []
+    total = 0
+    for image in sizes.find_images(game, folder):
+        key = image.relative_to(game)
+        mtime = image.stat().st_mtime_ns
+        for (width, height) in targets:
+            total += 1
+            target = output / "{}x{}".format(width, height) / key
+            if target.is_file() and target.stat().st_mtime_ns >= mtime:
+                continue
+            tasks.append((str(image), str(target), width, height))
+
+    written = 0
+    if tasks:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            written = sum(executor.map(render, tasks, chunksize=16))
+
+    return total, written
@@ -1,9 +1,11 @@
+import argparse
 import glob
 import os.path
 import pathlib
 import generation.converts as converts
 import generation.copyright as gencopy
 import generation.dump_py as dumpy
+import generation.sizes as gensizes
 
 release_year = 2023
 repo = "https://github.com/yoimerdr/gallerynpy"
@@ -57,6 +59,16 @@ def generate_dumpy_renpy():
                                 *args
                             ])
                         ]
+                    ),
+                    dumpy.PyClass(
+                        name="Crop",
+                        parent=dumpy.Nameable("Displayable"),
+                        methods=[
+                            dumpy.PyFunction(name="__init__", params=[
+                                dumpy.PyParameter("im"),
+                                dumpy.PyParameter("rect")
+                            ])
+                        ]
                     )
                 ]
             ),
@@ -88,12 +100,29 @@ def generate_dumpy_renpy():
                 params=[dumpy.PyParameter("path")],
                 simple_return="True"
             ),
+            dumpy.PyFunction(
+                name="list_files",
+                params=[dumpy.PyParameter("common", value="False", has_value=True)],
+                simple_return="[]"
+            ),
             dumpy.PyFunction(
                 name="get_registered_image",
                 params=[dumpy.PyParameter("name")],
                 simple_return="Image(name)"
             ),
-            dumpy.PyFunction(name="restart_interaction")
+            dumpy.PyFunction(
+                name="open_file",
+                params=[dumpy.PyParameter("path"), dumpy.PyParameter("encoding", value="False", has_value=True)],
+                simple_return="open(path, 'rb')"
+            ),
+            dumpy.PyFunction(name="restart_interaction"),
+            dumpy.PyFunction(
+                name="invoke_in_thread",
+                params=[dumpy.PyParameter("fn"), dumpy.PyParameter("*args"), dumpy.PyParameter("**kwargs")],
+                simple_return="fn(*args, **kwargs)"
+            ),
+            dumpy.PyFunction(name="start_predict", params=[dumpy.PyParameter("*args")]),
+            dumpy.PyFunction(name="stop_predict", params=[dumpy.PyParameter("*args")])
         ],
         packages=[
             display_pck
@@ -111,7 +140,9 @@ def generate_dumpy_renpy():
             )
         ],
         variables=[
-            dumpy.PyVariable(name="dissolve")
+            dumpy.PyVariable(name="dissolve"),
+            dumpy.PyVariable(name="python_object", value="object"),
+            dumpy.PyVariable(name="python_dict", value="dict")
         ],
         classes=[
             dumpy.PyClass(
@@ -143,6 +174,15 @@ def generate_dumpy_renpy():
                     ])
                 ]
             ),
+            dumpy.PyClass(
+                name="Transform",
+                methods=[
+                    dumpy.PyFunction(name="__init__", params=[
+                        dumpy.PyParameter("child", "None", True),
+                        dumpy.PyParameter("**properties")
+                    ])
+                ]
+            ),
             dumpy.PyClass(name="Button", methods=[
                 dumpy.PyFunction(name="__init__", params=[
                     dumpy.PyParameter(name="action")
@@ -232,7 +272,72 @@ def generate_rpy():
     gencopy.add_to(out.glob("**/*.rpy"), release_year, "Yoimer Davila", repo)
 
 
-# generate_dumpy_renpy()
-# add_copyright()
+def precompute_sizes(game: str, output: str = None, workers: int = None):
+    """
+    Precompute the dimensions of the images in the `images` folder of a game, and write them into its gallerynpy db file,
+    so the players don't have to load every image the first time.
+    """
+    total, probed = gensizes.precompute(game, output=output, workers=workers)
+    print("{} images, {} probed".format(total, probed))
+
+
+def generate_thumbnails(game: str, screen: str = None, distributions: list[str] = None, output: str = None,
+                        workers: int = None, atlas: bool = False):
+    """
+    Generate the pre-scaled thumbnails of the images in the `images` folder of a game, for the given distributions,
+    so the gallery doesn't have to scale the full size images. Optionally, pack them into atlas sheets.
+    """
+    # imported here, so Pillow is only needed by this command
+    import generation.atlas as genatlas
+    import generation.thumbnails as genthumbnails
+
+    screen = tuple(int(value) for value in screen.split("x")) if screen else (1920, 1080)
+    if distributions:
+        distributions = [tuple(int(value) for value in item.split("x")) for item in distributions]
+    else:
+        distributions = genthumbnails.DISTRIBUTIONS
+    total, written = genthumbnails.generate(game, screen, distributions, output=output, workers=workers)
+    print("{} thumbnails, {} written".format(total, written))
+    if not atlas:
+        return
+
+    folder = pathlib.Path(game).resolve() / (output or os.path.join("gallerynpy", "prescaled"))
+    for (width, height) in genthumbnails.thumbnail_sizes(screen, distributions):
+        total, sheets = genatlas.pack(str(folder / "{}x{}".format(width, height)), workers=workers)
+        print("{}x{}: {} thumbnails, {} sheets written".format(width, height, total, sheets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gallerynpy build tools.")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("rpy", help="generate the .rpy files into the dist folder (default)")
+    sizes = commands.add_parser("sizes", help="precompute the gallerynpy db file of a game")
+    sizes.add_argument("game", help="the game folder of the game")
+    sizes.add_argument("--output", help="the db file, relative to the game folder (default gallerynpy/db/images.json)")
+    sizes.add_argument("--workers", type=int, help="the number of processes (default the number of cpus)")
+    thumbnails = commands.add_parser("thumbnails", help="generate the pre-scaled thumbnails of a game")
+    thumbnails.add_argument("game", help="the game folder of the game")
+    thumbnails.add_argument("--screen", help="the screen size of the game, as WIDTHxHEIGHT (default 1920x1080)")
+    thumbnails.add_argument("--distribution", action="append", dest="distributions",
+                            help="a distribution on each page, as COLUMNSxROWS. Can be repeated (default 4x4)")
+    thumbnails.add_argument("--output", help="the thumbnails folder, relative to the game folder "
+                                             "(default gallerynpy/prescaled)")
+    thumbnails.add_argument("--workers", type=int, help="the number of processes (default the number of cpus)")
+    thumbnails.add_argument("--atlas", action="store_true", help="also pack the thumbnails into atlas sheets")
+    args = parser.parse_args()
+
+    if args.command == "sizes":
+        precompute_sizes(args.game, args.output, args.workers)
+        return
+    if args.command == "thumbnails":
+        generate_thumbnails(args.game, args.screen, args.distributions, args.output, args.workers, args.atlas)
+        return
+
+    # generate_dumpy_renpy()
+    # add_copyright()
+
+    generate_rpy()
+
 
-generate_rpy()
+if __name__ == "__main__":
+    main()
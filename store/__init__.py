@@ -28,6 +28,11 @@ class Composite:
         pass
 
 
+class Transform:
+    def __init__(self, child=None, **properties):
+        pass
+
+
 class Button:
     def __init__(self, action):
         pass
@@ -79,4 +84,6 @@ class Gallery:
         pass
 
 dissolve = None
+python_object = object
+python_dict = dict
 
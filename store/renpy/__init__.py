@@ -6,9 +6,29 @@ def loadable(path):
     return True
 
 
+def list_files(common=False):
+    return []
+
+
 def get_registered_image(name):
     return Image(name)
 
 
+def open_file(path, encoding=False):
+    return open(path, 'rb')
+
+
 def restart_interaction():
-    pass
\ No newline at end of file
+    pass
+
+
+def invoke_in_thread(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def start_predict(*args):
+    pass
+
+
+def stop_predict(*args):
+    pass
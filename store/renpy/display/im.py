@@ -18,3 +18,8 @@ class Scale(Displayable):
     def __init__(self, path, width, height, *args, **kwargs):
         pass
 
+
+class Crop(Displayable):
+    def __init__(self, im, rect):
+        pass
+
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+from generation import stored
+
+gallerynpy = stored.load_stored("db")
+
+
+class StorageFallbackTest(object):
+    storage = None
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, "images" + self.storage.EXTENSION)
+        # the second write keeps the first one as backup
+        self.create().write({"images/a.png": (10, 20)})
+        self.create().write({"images/b.png": (30, 40)})
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def create(self):
+        storage = self.storage(self.source)
+        storage.load()
+        return storage
+
+    def test_intact(self):
+        storage = self.create()
+        self.assertEqual((30, 40), storage.get("images/b.png"))
+        self.assertEqual(0, storage.fallbacks)
+
+    def test_corrupt_falls_back(self):
+        with open(self.source, "r+b") as fs:
+            fs.seek(-2, os.SEEK_END)
+            fs.write(b"\x00\x00")
+        storage = self.create()
+        self.assertEqual((10, 20), storage.get("images/a.png"))
+        self.assertIsNone(storage.get("images/b.png"))
+        self.assertEqual(1, storage.fallbacks)
+
+    def test_torn_falls_back(self):
+        with open(self.source, "r+b") as fs:
+            fs.truncate(os.path.getsize(self.source) // 2)
+        storage = self.create()
+        self.assertEqual((10, 20), storage.get("images/a.png"))
+        self.assertEqual(1, storage.fallbacks)
+
+    def test_missing_falls_back(self):
+        os.remove(self.source)
+        storage = self.create()
+        self.assertEqual((10, 20), storage.get("images/a.png"))
+        self.assertEqual(1, storage.fallbacks)
+
+    def test_corrupt_without_backup(self):
+        os.remove(self.source + self.storage.BACKUP_EXTENSION)
+        with open(self.source, "wb") as fs:
+            fs.write(b"garbage")
+        storage = self.storage(self.source)
+        self.assertFalse(storage.load())
+        self.assertIsNone(storage.get("images/a.png"))
+        self.assertEqual(0, storage.fallbacks)
+
+
+class JsonStorageFallbackTest(StorageFallbackTest, unittest.TestCase):
+    storage = gallerynpy.JsonSizesStorage
+
+
+class BinaryStorageFallbackTest(StorageFallbackTest, unittest.TestCase):
+    storage = gallerynpy.BinarySizesStorage
+
+    def test_oversized_are_returned(self):
+        storage = self.create()
+        oversized = storage.write({"images/c.png": (70000, 10), "images/d.png": (50, 60)})
+        storage.close()
+        self.assertEqual({"images/c.png": (70000, 10)}, oversized)
+        storage = self.create()
+        self.assertIsNone(storage.get("images/c.png"))
+        self.assertEqual((50, 60), storage.get("images/d.png"))
+        storage.close()
+
+
+class SizesJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.journal = gallerynpy.SizesJournal(os.path.join(self.folder, "images.json.journal"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_replay(self):
+        self.journal.append({"images/a.png": (10, 20)})
+        self.journal.append({"images/a.png": (30, 40), "images/b.png": (50, 60)})
+        self.assertEqual({"images/a.png": (30, 40), "images/b.png": (50, 60)}, self.journal.replay())
+        self.assertEqual(3, self.journal.count)
+
+    def test_torn_last_line_is_ignored(self):
+        self.journal.append({"images/a.png": (10, 20)})
+        with open(self.journal.source, "a") as fs:
+            fs.write('["images/b.png", 3')
+        self.assertEqual({"images/a.png": (10, 20)}, self.journal.replay())
+        self.assertEqual(1, self.journal.count)
+
+    def test_append_after_torn_line(self):
+        self.journal.append({"images/a.png": (10, 20)})
+        with open(self.journal.source, "a") as fs:
+            fs.write('["images/b.png", 3')
+        self.journal.replay()
+        self.journal.append({"images/c.png": (50, 60)})
+        self.assertEqual({"images/a.png": (10, 20), "images/c.png": (50, 60)}, self.journal.replay())
+
+    def test_clear(self):
+        self.journal.append({"images/a.png": (10, 20)})
+        self.journal.clear()
+        self.assertFalse(os.path.exists(self.journal.source))
+        self.assertEqual({}, self.journal.replay())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import struct
+import unittest
+from generation import stored
+
+dimensions = stored.load_module("dimensions")
+
+
+def png(width: int, height: int) -> bytes:
+    return dimensions.PNG_SIGNATURE + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height,
+                                                                                     8, 6, 0, 0, 0)
+
+
+def jpeg(width: int, height: int, marker: int = 0xC0) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff" + bytes([marker]) + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return dimensions.JPEG_SIGNATURE + app0 + b"\xff" + sof
+
+
+def webp(chunk: bytes, data: bytes) -> bytes:
+    body = dimensions.WEBP_SIGNATURE + chunk + struct.pack("<I", len(data)) + data
+    return dimensions.RIFF_SIGNATURE + struct.pack("<I", len(body)) + body
+
+
+class ProbeTest(unittest.TestCase):
+
+    def probe(self, content: bytes):
+        return dimensions.probe(io.BytesIO(content))
+
+    def test_png(self):
+        self.assertEqual((1920, 1080), self.probe(png(1920, 1080)))
+
+    def test_png_truncated(self):
+        self.assertIsNone(self.probe(png(1920, 1080)[:20]))
+
+    def test_jpeg(self):
+        self.assertEqual((800, 600), self.probe(jpeg(800, 600)))
+
+    def test_jpeg_progressive(self):
+        self.assertEqual((800, 600), self.probe(jpeg(800, 600, marker=0xC2)))
+
+    def test_jpeg_without_frame(self):
+        self.assertIsNone(self.probe(dimensions.JPEG_SIGNATURE + b"\xff\xda\x00\x08" + b"\x00" * 6))
+
+    def test_jpeg_truncated(self):
+        self.assertIsNone(self.probe(jpeg(800, 600)[:-8]))
+
+    def test_webp_lossy(self):
+        frame = b"\x00\x00\x00" + b"\x9d\x01\x2a" + struct.pack("<HH", 640, 480)
+        self.assertEqual((640, 480), self.probe(webp(b"VP8 ", frame)))
+
+    def test_webp_lossless(self):
+        bits = (640 - 1) | ((480 - 1) << 14)
+        self.assertEqual((640, 480), self.probe(webp(b"VP8L", b"\x2f" + struct.pack("<I", bits) + b"\x00" * 8)))
+
+    def test_webp_extended(self):
+        canvas = b"\x00" * 4 + struct.pack("<I", 4000 - 1)[:3] + struct.pack("<I", 3000 - 1)[:3]
+        self.assertEqual((4000, 3000), self.probe(webp(b"VP8X", canvas)))
+
+    def test_webp_invalid_chunk(self):
+        self.assertIsNone(self.probe(webp(b"ABCD", b"\x00" * 10)))
+
+    def test_unsupported(self):
+        self.assertIsNone(self.probe(b"GIF89a" + b"\x00" * 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
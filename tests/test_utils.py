@@ -0,0 +1,31 @@
+import unittest
+from generation import stored
+
+gallerynpy = stored.load_stored()
+
+
+class NaturalKeyTest(unittest.TestCase):
+
+    def test_numbers_by_value(self):
+        self.assertEqual(["ch2", "ch10"], sorted(["ch10", "ch2"], key=gallerynpy.natural_key))
+
+    def test_letters_regardless_of_case(self):
+        self.assertEqual(["a2", "B1"], sorted(["B1", "a2"], key=gallerynpy.natural_key))
+
+    def test_ties_by_padding(self):
+        self.assertEqual(gallerynpy.natural_key("a01")[0], gallerynpy.natural_key("a1")[0])
+        self.assertEqual(["a01", "a1"], sorted(["a1", "a01"], key=gallerynpy.natural_key))
+
+    def test_ties_by_case(self):
+        self.assertEqual(gallerynpy.natural_key("A1")[0], gallerynpy.natural_key("a1")[0])
+        self.assertEqual(["A1", "a1"], sorted(["a1", "A1"], key=gallerynpy.natural_key))
+
+    def test_ties_are_stable_for_any_order(self):
+        names = ["a1", "A01", "a01", "A1"]
+        expected = sorted(names, key=gallerynpy.natural_key)
+        self.assertEqual(expected, sorted(reversed(names), key=gallerynpy.natural_key))
+        self.assertEqual(["A01", "A1", "a01", "a1"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()